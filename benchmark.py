@@ -0,0 +1,281 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Script used to measure the performances of the mazes.
+
+:author: `BART Sébastien / ELABDALLAH Mohammed / KROL Mikolaï`
+
+:date: 2018, november.
+
+In a terminal:
+$ python3 benchmark.py storage 1000 1000
+$ python3 benchmark.py generation 100 500 2000
+$ python3 benchmark.py algorithms 100 300
+$ python3 benchmark.py tiled 2000 1 2 4 8
+$ python3 benchmark.py solvers 1000 10
+$ python3 benchmark.py threads 300 200 1 2 4 8
+
+
+"""
+
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from class_Maze import *
+from perfect_maze import perfect_maze, GENERATORS
+from parallel_maze import tiled_perfect_maze
+from solvers import SOLVERS, bfs_path
+
+
+def usage():
+    """
+    Show how to use benchmark.py correctly.
+    """
+    print('---------------------------------------------------------------------')
+    print("Utilisation de benchmark.py:")
+    print("python3 benchmark.py storage <WIDTH> <HEIGHT>")
+    print("python3 benchmark.py generation <SIZE> ...")
+    print("python3 benchmark.py algorithms <SIZE> ...")
+    print("python3 benchmark.py tiled <SIZE> <WORKERS> ...")
+    print("python3 benchmark.py solvers <SIZE> <QUERIES>")
+    print("python3 benchmark.py threads <SIZE> <QUERIES> <THREADS> ...")
+    print("<WIDTH> = (int) width of the mazes")
+    print("<HEIGHT> = (int) height of the mazes")
+    print("<SIZE> = (int) width and height of a square maze")
+    print("<WORKERS> = (int) number of processes")
+    print("<QUERIES> = (int) number of paths searched")
+    print("<THREADS> = (int) number of threads")
+    print('---------------------------------------------------------------------')
+
+
+def measure(function, *args):
+    """
+    Calls function with args and measures the time it takes and the peak of memory it allocates.
+
+    :param function: the function to measure
+    :type function: function
+    :return: the result of the call, the time in seconds and the peak of memory in bytes
+    :rtype: tuple
+
+    :Examples:
+    >>> result, seconds, peak = measure(Maze, 10, 10)
+    >>> result.get_width()
+    10
+    >>> peak > 0
+    True
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def cell_grid(width, height):
+    """
+    Returns a grid of Cell objects with the walls of the outline set, as mazes were stored before.
+
+    :param width: width of the grid
+    :type width: int
+    :param height: height of the grid
+    :type height: int
+    :return: the grid
+    :rtype: list
+    """
+    grid = [[Cell() for i in range(width)] for j in range(height)]
+    for cell in grid[0]:
+        cell.set_wall_up()
+    for cell in grid[-1]:
+        cell.set_wall_down()
+    for line in grid:
+        line[0].set_wall_left()
+        line[-1].set_wall_right()
+    return grid
+
+
+def bench_storage(width, height):
+    """
+    Compares the construction time and the memory of a grid of Cell objects and of a Maze.
+
+    :param width: width of the mazes
+    :type width: int
+    :param height: height of the mazes
+    :type height: int
+    :return: None
+    :side effect: prints the comparison
+    """
+    print('{:d}x{:d} cells'.format(width, height))
+    for name, function in (('Cell grid', cell_grid), ('Maze', Maze)):
+        result, seconds, peak = measure(function, width, height)
+        print('{:<10} {:10.3f} s {:12.1f} MiB'.format(name, seconds, peak / 2**20))
+
+
+def bench_generation(*sizes):
+    """
+    Measures the generation time of square perfect mazes of each size.
+    The time per cell should not grow with the size.
+
+    :param sizes: the sides of the mazes
+    :type sizes: int
+    :return: None
+    :side effect: prints the time of each generation
+    """
+    for size in sizes:
+        start = time.perf_counter()
+        perfect_maze(size, size)
+        seconds = time.perf_counter() - start
+        print('{:d}x{:d} {:10.3f} s {:8.2f} us/cell'.format(size, size, seconds, seconds * 1e6 / size**2))
+
+
+def bench_algorithms(*sizes):
+    """
+    Measures the number of cells generated per second by each algorithm of GENERATORS,
+    for square perfect mazes of each size.
+
+    :param sizes: the sides of the mazes
+    :type sizes: int
+    :return: None
+    :side effect: prints the cells per second of each algorithm and size
+    """
+    print('{:<15}'.format('cells/s') + ''.join('{:>12}'.format('{:d}x{:d}'.format(size, size)) for size in sizes))
+    for algorithm in GENERATORS:
+        line = '{:<15}'.format(algorithm)
+        for size in sizes:
+            start = time.perf_counter()
+            perfect_maze(size, size, algorithm)
+            seconds = time.perf_counter() - start
+            line += '{:12.0f}'.format(size**2 / seconds)
+        print(line)
+
+
+def bench_tiled(size, *workers):
+    """
+    Measures the generation time of a square perfect maze built tile by tile
+    with each number of processes, and the speedup against one process.
+    The time with one process is always measured first, as the reference.
+
+    :param size: the side of the maze
+    :type size: int
+    :param workers: the numbers of processes
+    :type workers: int
+    :return: None
+    :side effect: prints the time and the speedup of each number of processes
+    """
+    reference = None
+    for count in (1,) + tuple(count for count in workers if count != 1):
+        start = time.perf_counter()
+        tiled_perfect_maze(size, size, workers=count)
+        seconds = time.perf_counter() - start
+        if reference is None:
+            reference = seconds
+        print('{:3d} processes {:10.3f} s  speedup {:5.2f}'.format(count, seconds, reference / seconds))
+
+
+def braided_maze(width, height, seed=0):
+    """
+    Returns a perfect maze of size width*height in which a tenth of the walls inside
+    the maze have been removed, so that it has many loops.
+
+    :param width: width of the maze
+    :type width: int
+    :param height: height of the maze
+    :type height: int
+    :param seed: the seed of the maze
+    :type seed: int
+    :return: the maze
+    :rtype: Maze
+
+    :Examples:
+    >>> braided_maze(20, 20).find_path() is None
+    False
+    """
+    maze = perfect_maze(width, height, 'eller', seed)
+    rng = random_generator(seed)
+    for i in range(width * height // 10):
+        x, y = rng.randrange(width), rng.randrange(height)
+        if x < width - 1:
+            maze.delete_walls_right(x, y)
+        if y < height - 1:
+            maze.delete_walls_down(x, y)
+    return maze
+
+
+def bench_solvers(size, queries):
+    """
+    Measures the time taken by each algorithm of SOLVERS to find paths between random
+    cells of a square perfect maze and of a square maze with loops, for far cells and
+    for cells at most a twentieth of the size apart.
+
+    :param size: the side of the mazes
+    :type size: int
+    :param queries: the number of paths searched in each maze
+    :type queries: int
+    :return: None
+    :side effect: prints the mean time of a search of each algorithm
+    """
+    rng = random_generator(0)
+    near = max(1, size // 20)
+    for name, maze in (('perfect', perfect_maze(size, size, 'eller', 0)), ('braided', braided_maze(size, size))):
+        starts = [(rng.randrange(size), rng.randrange(size)) for i in range(queries)]
+        far = [(rng.randrange(size), rng.randrange(size)) for i in range(queries)]
+        close = [(min(size - 1, max(0, x + rng.randint(-near, near))), min(size - 1, max(0, y + rng.randint(-near, near))))
+                 for (x, y) in starts]
+        for distance, goals in (('far', far), ('near', close)):
+            for algorithm, solver in SOLVERS.items():
+                start = time.perf_counter()
+                for source, goal in zip(starts, goals):
+                    solver(maze, source, goal)
+                seconds = time.perf_counter() - start
+                print('{:<8} {:<5} {:<14} {:10.4f} s/path'.format(name, distance, algorithm, seconds / queries))
+
+
+def bench_threads(size, queries, *threads):
+    """
+    Measures the number of paths found per second by a pool of threads sharing one square
+    perfect maze, for each number of threads.
+
+    :param size: the side of the maze
+    :type size: int
+    :param queries: the number of paths searched for each number of threads
+    :type queries: int
+    :return: None
+    :side effect: prints the number of paths found per second for each number of threads
+    """
+    rng = random_generator(0)
+    maze = perfect_maze(size, size, 'eller', 0)
+    pairs = [((rng.randrange(size), rng.randrange(size)), (rng.randrange(size), rng.randrange(size)))
+             for i in range(queries)]
+    expected = [len(bfs_path(maze, start, goal)) for start, goal in pairs]
+    for count in threads:
+        with ThreadPoolExecutor(count) as executor:
+            start = time.perf_counter()
+            lengths = [len(path) for path in executor.map(lambda pair: bfs_path(maze, *pair), pairs)]
+            seconds = time.perf_counter() - start
+        assert lengths == expected, 'the threads found different paths'
+        print('{:>3} threads {:10.1f} paths/s'.format(count, queries / seconds))
+
+
+BENCHMARKS = {'storage': bench_storage,
+              'generation': bench_generation,
+              'algorithms': bench_algorithms,
+              'tiled': bench_tiled,
+              'solvers': bench_solvers,
+              'threads': bench_threads}
+
+
+def main():
+    try:
+        benchmark = BENCHMARKS[sys.argv[1]]
+        args = [int(arg) for arg in sys.argv[2:]]
+    except (IndexError, ValueError, KeyError):
+        usage()
+    else:
+        benchmark(*args)
+
+
+if __name__ == '__main__':
+    main()
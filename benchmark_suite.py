@@ -0,0 +1,278 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Script used to measure how the time and the memory of the main operations grow with
+the size of the mazes, and to detect the regressions against a previous report.
+
+:author: `BART Sébastien / ELABDALLAH Mohammed / KROL Mikolaï`
+
+:date: 2018, november.
+
+In a terminal:
+$ python3 benchmark_suite.py report.json
+$ python3 benchmark_suite.py report.json baseline.json
+$ python3 benchmark_suite.py report.json baseline.json 10 100 1000
+
+Each operation of OPERATIONS is run on square mazes of each size of the ladder,
+built with fixed seeds. The time of the fastest of a few runs and the peak of memory
+allocated by one run are recorded, and the exponent k of the best fit time = c * n**k
+is computed over the numbers n of cells. The report is written in a JSON file. When a
+baseline report is given, the operations slower or heavier than tolerance times the
+baseline are printed and the script exits with the status 1.
+
+
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import tempfile
+import platform
+import tracemalloc
+from class_Maze import *
+from perfect_maze import perfect_maze
+from txt_to_maze import file_to_maze
+
+
+SIZES = (10, 30, 100, 300, 1000)
+
+# a run shorter than that is too noisy to be compared with the baseline
+NOISE_SECONDS = 0.005
+
+
+def generation(size, seed, folder):
+    return lambda: perfect_maze(size, size, 'backtracker', seed)
+
+
+def solving(size, seed, folder):
+    maze = perfect_maze(size, size, 'backtracker', seed)
+    def solve():
+        # the paths found by a previous run must not be taken from the cache of the maze
+        maze.bump_version()
+        return maze.solve(display=False)
+    return solve
+
+
+def representation(size, seed, folder):
+    maze = perfect_maze(size, size, 'backtracker', seed)
+    return lambda: repr(maze)
+
+
+def writing(size, seed, folder):
+    maze = perfect_maze(size, size, 'backtracker', seed)
+    return lambda: maze.to_txt(os.path.join(folder, 'txt', 'written.txt'))
+
+
+def reading(size, seed, folder):
+    name = 'read_{:d}.txt'.format(size)
+    perfect_maze(size, size, 'backtracker', seed).to_txt(os.path.join(folder, 'txt', name))
+    return lambda: file_to_maze(name)
+
+
+# each function returns the operation to measure on a maze of size*size cells
+OPERATIONS = {'perfect_maze': generation,
+              'solve': solving,
+              'repr': representation,
+              'to_txt': writing,
+              'file_to_maze': reading}
+
+
+def fit_exponent(counts, values):
+    """
+    Returns the exponent k of the least squares fit of log(value) = log(c) + k * log(count).
+
+    :param counts: the numbers of cells
+    :type counts: list
+    :param values: the measures, the ones which are not positive are ignored
+    :type values: list
+    :return: the exponent, None if less than two measures are positive
+    :rtype: float or NoneType
+
+    :Examples:
+    >>> round(fit_exponent([10, 100, 1000], [3, 300, 30000]), 6)
+    2.0
+    >>> fit_exponent([10, 100], [0, 1]) is None
+    True
+    """
+    points = [(math.log(count), math.log(value)) for count, value in zip(counts, values) if value > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, y in points) / len(points)
+    mean_y = sum(y for x, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, y in points)
+    if variance == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def run_operation(operation, cells):
+    """
+    Returns the time of the fastest of a few runs of operation, and the peak of memory
+    allocated by one run. Fewer runs are done for the larger mazes.
+
+    :param operation: the operation to measure
+    :type operation: function
+    :param cells: the number of cells of the maze
+    :type cells: int
+    :return: the time in seconds and the peak in bytes
+    :rtype: tuple
+
+    :Examples:
+    >>> seconds, peak = run_operation(lambda: bytearray(10000), 100)
+    >>> seconds > 0, peak >= 10000
+    (True, True)
+    """
+    seconds = None
+    for run in range(max(1, min(5, 10**5 // cells))):
+        start = time.perf_counter()
+        operation()
+        elapsed = time.perf_counter() - start
+        if seconds is None or elapsed < seconds:
+            seconds = elapsed
+    tracemalloc.start()
+    operation()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def scaling_report(sizes=SIZES, seed=0, operations=None):
+    """
+    Returns the report of the measures of each operation on square mazes of each size.
+
+    :param sizes: the sides of the mazes
+    :type sizes: iterable
+    :param seed: the seed of the mazes
+    :type seed: int
+    :param operations: the names of the operations measured, all the keys of OPERATIONS if None
+    :type operations: list
+    :return: the report, which can be written in a JSON file
+    :rtype: dict
+
+    :Examples:
+    >>> report = scaling_report((4, 8), operations=['perfect_maze', 'file_to_maze'])
+    >>> sorted(report['operations'])
+    ['file_to_maze', 'perfect_maze']
+    >>> len(report['operations']['perfect_maze']['seconds'])
+    2
+    """
+    sizes = list(sizes)
+    counts = [size * size for size in sizes]
+    report = {'sizes': sizes,
+              'seed': seed,
+              'python': platform.python_version(),
+              'operations': {}}
+    directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as folder:
+        # file_to_maze reads its files from the folder ../txt
+        os.makedirs(os.path.join(folder, 'txt'))
+        os.makedirs(os.path.join(folder, 'run'))
+        os.chdir(os.path.join(folder, 'run'))
+        try:
+            for name in operations or OPERATIONS:
+                measures = [run_operation(OPERATIONS[name](size, seed, folder), size * size) for size in sizes]
+                seconds = [measure[0] for measure in measures]
+                peaks = [measure[1] for measure in measures]
+                report['operations'][name] = {'seconds': seconds,
+                                              'peak': peaks,
+                                              'time_exponent': fit_exponent(counts, seconds),
+                                              'memory_exponent': fit_exponent(counts, peaks)}
+        finally:
+            os.chdir(directory)
+    return report
+
+
+def regressions(report, baseline, tolerance=2.0, exponent_tolerance=0.25):
+    """
+    Returns the descriptions of the regressions of report against baseline : the measures
+    more than tolerance times the ones of the baseline for the same operation and size,
+    and the exponents grown by more than exponent_tolerance.
+
+    :param report: a report returned by scaling_report
+    :type report: dict
+    :param baseline: a previous report
+    :type baseline: dict
+    :param tolerance: the allowed ratio between a measure and the one of the baseline
+    :type tolerance: float
+    :param exponent_tolerance: the allowed growth of an exponent
+    :type exponent_tolerance: float
+    :return: the descriptions of the regressions
+    :rtype: list
+
+    :Examples:
+    >>> old = {'sizes': [10, 100], 'operations': {'solve': {'seconds': [0.01, 1.0], 'peak': [10, 1000],
+    ...                                                     'time_exponent': 1.0, 'memory_exponent': 1.0}}}
+    >>> new = {'sizes': [10, 100], 'operations': {'solve': {'seconds': [0.01, 4.0], 'peak': [10, 1000],
+    ...                                                     'time_exponent': 1.3, 'memory_exponent': 1.0}}}
+    >>> for line in regressions(new, old):
+    ...     print(line)
+    solve 100x100: 4.0000 s instead of 1.0000 s
+    solve: time exponent 1.30 instead of 1.00
+    >>> regressions(old, old)
+    []
+    """
+    found = []
+    for name, measures in report['operations'].items():
+        if name not in baseline['operations']:
+            continue
+        previous = baseline['operations'][name]
+        for size, seconds, peak in zip(report['sizes'], measures['seconds'], measures['peak']):
+            if size not in baseline['sizes']:
+                continue
+            rank = baseline['sizes'].index(size)
+            if seconds > NOISE_SECONDS and seconds > tolerance * previous['seconds'][rank]:
+                found.append('{} {:d}x{:d}: {:.4f} s instead of {:.4f} s'.format(name, size, size, seconds, previous['seconds'][rank]))
+            if peak > tolerance * previous['peak'][rank]:
+                found.append('{} {:d}x{:d}: {:d} bytes instead of {:d} bytes'.format(name, size, size, peak, previous['peak'][rank]))
+        for key in ('time_exponent', 'memory_exponent'):
+            if measures[key] is not None and previous[key] is not None and measures[key] > previous[key] + exponent_tolerance:
+                found.append('{}: {} {:.2f} instead of {:.2f}'.format(name, key.replace('_', ' '), measures[key], previous[key]))
+    return found
+
+
+def usage():
+    """
+    Show how to use benchmark_suite.py correctly.
+    """
+    print('---------------------------------------------------------------------')
+    print("Utilisation de benchmark_suite.py:")
+    print("python3 benchmark_suite.py <REPORT> [<BASELINE>] [<SIZE> ...]")
+    print("<REPORT> = (str) JSON file where the report is written")
+    print("<BASELINE> = (str) JSON file of a previous report")
+    print("<SIZE> = (int) width and height of a square maze")
+    print('---------------------------------------------------------------------')
+
+
+def main():
+    if len(sys.argv) < 2:
+        usage()
+        return 2
+    baseline = None
+    sizes = []
+    for arg in sys.argv[2:]:
+        if arg.isdigit():
+            sizes.append(int(arg))
+        else:
+            baseline = arg
+    report = scaling_report(sizes or SIZES)
+    with open(sys.argv[1], 'w') as out_stream:
+        json.dump(report, out_stream, indent=2)
+    for name, measures in report['operations'].items():
+        print('{:<14} time n^{:<6.2f} memory n^{:<6.2f} {:10.4f} s {:12.1f} MiB'.format(
+            name, measures['time_exponent'] or 0, measures['memory_exponent'] or 0,
+            measures['seconds'][-1], measures['peak'][-1] / 2**20))
+    if baseline is not None:
+        with open(baseline, 'r') as in_stream:
+            found = regressions(report, json.load(in_stream))
+        for line in found:
+            print('REGRESSION ' + line)
+        if found:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
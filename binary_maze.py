@@ -0,0 +1,390 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Script used to save mazes in a compact binary format.
+Use the functions write_binary and load_maze, or txt_to_binary and binary_to_txt.
+
+:author: `BART Sébastien / ELABDALLAH Mohammed / KROL Mikolaï`
+
+:date: 2018, november.
+
+A file starts with a header of 16 bytes : the magic bytes MAGIC, the version of the
+format, its flags, the width and the height of the maze, as described by HEADER.
+Each row follows, as one bit per cell for its right walls then one bit per cell for
+its bottom walls (and one bit per cell for the cells of the solution if the flag
+FLAG_DISPLAY is set). The bit of the cell x is the bit x % 8 of the byte x // 8, and
+each plane of bits takes a whole number of bytes, so a row starts at a known
+offset and can be read alone. A maze takes about a quarter of a byte per cell.
+
+The bits are packed and unpacked with big integer conversions, by blocks of rows.
+A file is read through mmap, so only the blocks actually decoded are read from the disk.
+
+In a terminal:
+$ python3 binary_maze.py maze.txt maze.bin
+$ python3 binary_maze.py maze.bin maze.txt
+
+
+"""
+
+import os
+import sys
+import mmap
+import struct
+from class_Maze import *
+from txt_to_maze import read_maze
+
+
+MAGIC = b'MAZB'
+VERSION = 1
+HEADER = struct.Struct('<4sHHII')
+
+# set if the rows have a third plane of bits for the cells of the solution
+FLAG_DISPLAY = 1
+
+# number of cells decoded or encoded at once
+BLOCK_CELLS = 2**20
+
+_RIGHT_CHARS = bytes(ord('1') if flags & WALL_RIGHT else ord('0') for flags in range(256))
+_DOWN_CHARS = bytes(ord('1') if flags & WALL_DOWN else ord('0') for flags in range(256))
+_DISPLAY_CHARS = bytes(ord('1') if flags & DISPLAY else ord('0') for flags in range(256))
+_CHAR_BITS = bytes.maketrans(b'01', b'\x00\x01')
+_DISPLAY_BITS = bytes([0, DISPLAY]) + bytes(254)
+
+
+def row_size(width, flags=0):
+    """
+    Returns the number of bytes of a row of a maze of the given width.
+
+    :param width: width of the maze
+    :type width: int
+    :param flags: the flags of the file
+    :type flags: int
+    :return: the number of bytes of a row
+    :rtype: int
+
+    :Examples:
+    >>> row_size(8), row_size(9), row_size(9, FLAG_DISPLAY)
+    (2, 4, 6)
+    """
+    planes = 3 if flags & FLAG_DISPLAY else 2
+    return planes * ((width + 7) // 8)
+
+
+def read_header(buffer):
+    """
+    Returns the width, the height and the flags of the maze stored in buffer.
+
+    :param buffer: the content of a binary maze file
+    :type buffer: bytes or mmap
+    :return: the width, the height and the flags
+    :rtype: tuple
+    :raise ValueError: if buffer is not a binary maze of a known version, or is truncated
+
+    :Examples:
+    >>> read_header(maze_to_binary(Maze(5, 3)))
+    (5, 3, 0)
+    >>> read_header(b'+-+-+\\n| | |\\n+-+-+\\n')
+    Traceback (most recent call last):
+    ...
+    ValueError: not a binary maze
+    >>> read_header(maze_to_binary(Maze(5, 3))[:-1])
+    Traceback (most recent call last):
+    ...
+    ValueError: truncated binary maze: 21 bytes instead of 22
+    """
+    if len(buffer) < HEADER.size:
+        raise ValueError('not a binary maze')
+    magic, version, flags, width, height = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError('not a binary maze')
+    if version != VERSION:
+        raise ValueError('unknown version {:d} of the binary maze format'.format(version))
+    length = HEADER.size + height * row_size(width, flags)
+    if len(buffer) < length:
+        raise ValueError('truncated binary maze: {:d} bytes instead of {:d}'.format(len(buffer), length))
+    return width, height, flags
+
+
+def encode_rows(cells, width, flags=0):
+    """
+    Returns the packed rows of the cells of consecutive rows of a maze.
+
+    :param cells: the flags of the cells, row after row
+    :type cells: bytes
+    :param width: width of the maze
+    :type width: int
+    :param flags: the flags of the file
+    :type flags: int
+    :return: the rows, in the format of the file
+    :rtype: bytes
+
+    :UC: len(cells) is a multiple of width
+
+    :Examples:
+    >>> encode_rows(bytes([WALL_RIGHT, 0, WALL_DOWN | WALL_RIGHT]), 3)
+    b'\\x05\\x04'
+    """
+    padding = b'0' * (8 * ((width + 7) // 8) - width)
+    tables = [_RIGHT_CHARS, _DOWN_CHARS]
+    if flags & FLAG_DISPLAY:
+        tables.append(_DISPLAY_CHARS)
+    planes = [bytes(cells).translate(table) for table in tables]
+    parts = []
+    for start in range(0, len(cells), width):
+        for plane in planes:
+            parts.append(plane[start:start + width])
+            parts.append(padding)
+    chars = b''.join(parts)
+    return int(chars[::-1], 2).to_bytes(len(chars) // 8, 'little')
+
+
+def decode_rows(buffer, first, last):
+    """
+    Returns the flags of the cells of the rows first to last-1 of the maze stored in buffer.
+    Only these rows, and the row above them, are read.
+
+    :param buffer: the content of a binary maze file
+    :type buffer: bytes or mmap
+    :param first: the first row
+    :type first: int
+    :param last: the row after the last row
+    :type last: int
+    :return: the flags of the cells, row after row
+    :rtype: bytes
+
+    :UC: 0 <= first < last <= height of the maze
+
+    :Examples:
+    >>> maze = Maze(4, 3)
+    >>> maze.build_walls_right(1, 1)
+    >>> maze.build_walls_down(2, 1)
+    >>> data = maze_to_binary(maze)
+    >>> decode_rows(data, 1, 3) == bytes(maze.get_cells()[4:])
+    True
+    """
+    width, height, flags = read_header(buffer)
+    size = row_size(width, flags)
+    plane = 8 * ((width + 7) // 8)
+    start = max(0, first - 1)
+    offset = HEADER.size + start * size
+    chunk = buffer[offset:offset + (last - start) * size]
+    bits = format(int.from_bytes(chunk, 'little'), '0{:d}b'.format(8 * len(chunk)))[::-1].encode('ascii').translate(_CHAR_BITS)
+    rows = range(8 * size * (first - start), len(bits), 8 * size)
+    rights = b''.join(bits[row:row + width] for row in rows)
+    downs = bytearray(b''.join(bits[row + plane:row + plane + width] for row in rows))
+    if last == height:
+        downs[-width:] = b'\x01' * width
+    above = bits[plane:plane + width] if first > 0 else b'\x01' * width
+    cells = wall_flags(width, rights, downs, above)
+    if flags & FLAG_DISPLAY:
+        displayed = b''.join(bits[row + 2 * plane:row + 2 * plane + width] for row in rows)
+        code = int.from_bytes(cells, 'little') | int.from_bytes(displayed.translate(_DISPLAY_BITS), 'little')
+        cells = code.to_bytes(len(cells), 'little')
+    return cells
+
+
+def block_rows(width):
+    """
+    Returns the number of rows encoded or decoded at once for a maze of the given width.
+
+    :param width: width of the maze
+    :type width: int
+    :return: the number of rows of a block
+    :rtype: int
+
+    :Examples:
+    >>> block_rows(2**30)
+    1
+    """
+    return max(1, BLOCK_CELLS // width)
+
+
+def binary_blocks(maze, display=False):
+    """
+    Yields the header and the blocks of rows of the binary description of maze.
+
+    :param maze: a maze
+    :type maze: Maze
+    :param display: if True, the cells of the solution are saved too
+    :type display: bool
+    :return: the parts of the content of the file
+    :rtype: generator
+    """
+    width = maze.get_width()
+    flags = FLAG_DISPLAY if display else 0
+    cells = maze.get_cells()
+    yield HEADER.pack(MAGIC, VERSION, flags, width, maze.get_height())
+    step = block_rows(width) * width
+    for start in range(0, len(cells), step):
+        yield encode_rows(cells[start:start + step], width, flags)
+
+
+def maze_to_binary(maze, display=False):
+    """
+    Returns the binary description of maze.
+
+    :param maze: a maze
+    :type maze: Maze
+    :param display: if True, the cells of the solution are saved too
+    :type display: bool
+    :return: the content of the file
+    :rtype: bytes
+
+    :Examples:
+    >>> len(maze_to_binary(Maze(9, 2)))
+    24
+    """
+    return b''.join(binary_blocks(maze, display))
+
+
+def binary_to_maze(buffer):
+    """
+    Returns the maze stored in buffer.
+
+    :param buffer: the content of a binary maze file
+    :type buffer: bytes or mmap
+    :return: the maze
+    :rtype: Maze
+
+    :Examples:
+    >>> from perfect_maze import perfect_maze
+    >>> maze = perfect_maze(13, 7, 'kruskal', 2)
+    >>> binary_to_maze(maze_to_binary(maze)).get_cells() == maze.get_cells()
+    True
+    >>> maze = maze.solve()
+    >>> str(binary_to_maze(maze_to_binary(maze, display=True))) == str(maze)
+    True
+    """
+    width, height, flags = read_header(buffer)
+    maze = Maze(width, height)
+    cells = maze.get_cells()
+    step = block_rows(width)
+    for first in range(0, height, step):
+        last = min(height, first + step)
+        cells[first * width:last * width] = decode_rows(buffer, first, last)
+    maze.bump_version()
+    return maze
+
+
+def write_binary(maze, file, display=False):
+    """
+    Writes maze in file, in the binary format, one block of rows at a time.
+
+    :param maze: a maze
+    :type maze: Maze
+    :param file: the path of the file or the binary stream to be written in
+    :type file: str, os.PathLike or file
+    :param display: if True, the cells of the solution are saved too
+    :type display: bool
+    :return: None
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'wb') as out_stream:
+            write_binary(maze, out_stream, display)
+        return
+    for block in binary_blocks(maze, display):
+        file.write(block)
+
+
+def open_mapped(file):
+    """
+    Returns a read only memory map of the binary maze file. Opening it doesn't read the file,
+    its pages are read from the disk when they are accessed.
+
+    :param file: the name of the file
+    :type file: str
+    :return: the map of the file
+    :rtype: mmap
+    :raise ValueError: if file is not a binary maze or is truncated
+    """
+    with open(file, 'rb') as in_stream:
+        mapped = mmap.mmap(in_stream.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        read_header(mapped)
+    except ValueError:
+        mapped.close()
+        raise
+    return mapped
+
+
+def load_maze(file):
+    """
+    Returns the maze stored in the binary maze file, read through a memory map.
+
+    :param file: the name of the file
+    :type file: str
+    :return: the maze
+    :rtype: Maze
+
+    :Examples:
+    >>> import pathlib, tempfile
+    >>> from perfect_maze import perfect_maze
+    >>> maze = perfect_maze(20, 10, 'wilson', 1)
+    >>> folder = tempfile.TemporaryDirectory()
+    >>> path = pathlib.Path(folder.name, 'maze.bin')
+    >>> write_binary(maze, path)
+    >>> load_maze(path).get_cells() == maze.get_cells()
+    True
+    >>> folder.cleanup()
+    """
+    mapped = open_mapped(file)
+    try:
+        return binary_to_maze(mapped)
+    finally:
+        mapped.close()
+
+
+def txt_to_binary(txt_file, binary_file):
+    """
+    Converts the description of a maze written by Maze.to_txt into the binary format.
+
+    :param txt_file: the name of the text file
+    :type txt_file: str
+    :param binary_file: the name of the binary file
+    :type binary_file: str
+    :return: None
+    """
+    write_binary(read_maze(txt_file), binary_file)
+
+
+def binary_to_txt(binary_file, txt_file):
+    """
+    Converts a binary maze file into the format written by Maze.to_txt.
+
+    :param binary_file: the name of the binary file
+    :type binary_file: str
+    :param txt_file: the name of the text file
+    :type txt_file: str
+    :return: None
+
+    :Examples:
+    >>> import os, tempfile
+    >>> from perfect_maze import perfect_maze
+    >>> maze = perfect_maze(6, 4, 'eller', 3)
+    >>> folder = tempfile.TemporaryDirectory()
+    >>> maze.to_txt(os.path.join(folder.name, 'maze.txt'))
+    >>> txt_to_binary(os.path.join(folder.name, 'maze.txt'), os.path.join(folder.name, 'maze.bin'))
+    >>> binary_to_txt(os.path.join(folder.name, 'maze.bin'), os.path.join(folder.name, 'copy.txt'))
+    >>> read_maze(os.path.join(folder.name, 'copy.txt')).get_cells() == maze.get_cells()
+    True
+    >>> folder.cleanup()
+    """
+    load_maze(binary_file).to_txt(txt_file)
+
+
+def main():
+    try:
+        source = sys.argv[1]
+        destination = sys.argv[2]
+    except IndexError:
+        print('Utilisation: python3 binary_maze.py <FILE.txt> <FILE.bin> ou python3 binary_maze.py <FILE.bin> <FILE.txt>')
+    else:
+        if source.endswith('.txt'):
+            txt_to_binary(source, destination)
+        else:
+            binary_to_txt(source, destination)
+
+
+if __name__ == '__main__':
+    main()
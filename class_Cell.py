@@ -10,9 +10,41 @@
 
 Cells are objects 
 
+A maze doesn't keep Cell objects : it stores each cell as one byte of flags
+in a bytearray (see the constants below) and the visited state of its cells
+in a VisitedStamps object. It hands out CellView objects which read and write
+them with the same methods as Cell.
+
 
 """
 
+from array import array
+
+#--- Flags of a cell stored in a byte ------------------------------------------------------------------------#
+
+WALL_UP = 1
+WALL_RIGHT = 2
+WALL_DOWN = 4
+WALL_LEFT = 8
+DISPLAY = 16
+
+ALL_WALLS = WALL_UP | WALL_RIGHT | WALL_DOWN | WALL_LEFT
+
+#--- Directions from a cell, in the order of Cell.get_walls ---------------------------------------------------#
+
+NORTH = 0
+EAST = 1
+SOUTH = 2
+WEST = 3
+
+WALLS = (WALL_UP, WALL_RIGHT, WALL_DOWN, WALL_LEFT)
+OPPOSITE_WALLS = (WALL_DOWN, WALL_LEFT, WALL_UP, WALL_RIGHT)
+
+# the directions without a wall, for each byte of flags of a cell
+OPEN_DIRECTIONS = tuple(tuple(direction for direction in range(4) if not flags & WALLS[direction])
+                        for flags in range(256))
+
+
 class Cell(object):
     """
     Creates a cell which compose a maze.
@@ -309,4 +341,230 @@ class Cell(object):
         True
         """
         return self.__is_visited
-       
+
+
+class VisitedStamps(object):
+    """
+    Visited state of the cells of a maze.
+    A cell is visited if its stamp is equal to the current epoch, so all the cells
+    are set as not visited at once by changing the epoch.
+    
+    >>> visited = VisitedStamps(3)
+    >>> visited.visit(1)
+    >>> visited.is_visited(1), visited.is_visited(2), visited.count()
+    (True, False, 1)
+    >>> visited.clear()
+    >>> visited.is_visited(1), visited.count()
+    (False, 0)
+    """
+    
+    def __init__(self, size):
+        """
+        Creates the visited state of size cells, none of them is visited.
+        
+        :param size: the number of cells
+        :type size: int
+        :UC: size >= 0
+        """
+        self.__stamps = array('H', bytes(2 * size))
+        self.__epoch = 1
+        self.__count = 0
+        
+    def visit(self, index):
+        """
+        Sets the cell at position index as visited.
+        """
+        if self.__stamps[index] != self.__epoch:
+            self.__stamps[index] = self.__epoch
+            self.__count += 1
+            
+    def unvisit(self, index):
+        """
+        Sets the cell at position index as not visited.
+        """
+        if self.__stamps[index] == self.__epoch:
+            self.__stamps[index] = 0
+            self.__count -= 1
+            
+    def is_visited(self, index):
+        """
+        Returns True if the cell at position index has been visited, False if not.
+        """
+        return self.__stamps[index] == self.__epoch
+    
+    def count(self):
+        """
+        Returns the number of visited cells.
+        """
+        return self.__count
+    
+    def clear(self):
+        """
+        Sets all the cells as not visited. The stamps are only erased when the epoch overflows.
+        
+        >>> visited = VisitedStamps(2)
+        >>> for i in range(70000):
+        ...     visited.visit(0)
+        ...     visited.clear()
+        >>> visited.visit(1)
+        >>> visited.is_visited(0), visited.is_visited(1)
+        (False, True)
+        """
+        self.__epoch += 1
+        self.__count = 0
+        if self.__epoch > 0xFFFF:
+            self.__stamps[:] = array('H', bytes(2 * len(self.__stamps)))
+            self.__epoch = 1
+
+
+class CellView(object):
+    """
+    Lightweight view on the byte of flags of a cell stored in a bytearray.
+    It has the same methods as Cell, so it can be used wherever a Cell is expected.
+    
+    >>> cells = bytearray(2)
+    >>> visited = VisitedStamps(2)
+    >>> c = CellView(cells, visited, 1)
+    >>> c.set_wall_down()
+    >>> c.set_wall_up()
+    >>> c.get_walls()
+    [True, False, True, False]
+    >>> cells[1] == WALL_UP | WALL_DOWN
+    True
+    >>> c.unset_wall_down()
+    >>> c.get_walls()
+    [True, False, False, False]
+    >>> c.set_visited()
+    >>> CellView(cells, visited, 1).is_visited()
+    True
+    """
+    
+    __slots__ = ('__cells', '__visited', '__index')
+    
+    def __init__(self, cells, visited, index):
+        """
+        Creates a view on the cell stored at position index of cells.
+        
+        :param cells: the flags of the cells of a maze
+        :type cells: bytearray
+        :param visited: the visited state of the cells of the maze
+        :type visited: VisitedStamps
+        :param index: the position of the cell in cells
+        :type index: int
+        :return: a view on the cell
+        :rtype: CellView
+        :UC: 0 <= index < len(cells)
+        """
+        self.__cells = cells
+        self.__visited = visited
+        self.__index = index
+        
+    def __set(self, flag):
+        self.__cells[self.__index] |= flag
+        
+    def __unset(self, flag):
+        self.__cells[self.__index] &= ~flag
+        
+    def __get(self, flag):
+        return self.__cells[self.__index] & flag != 0
+        
+    def display_on(self):
+        """
+        Sets the display flag of the cell
+        """
+        self.__set(DISPLAY)
+        
+    def display_off(self):
+        """
+        Unsets the display flag of the cell
+        """
+        self.__unset(DISPLAY)
+        
+    def is_displayed(self):
+        """
+        Returns True if the display flag of the cell is set, False if not
+        """
+        return self.__get(DISPLAY)
+        
+    def set_wall_up(self):
+        """
+        Sets the top wall of the cell.
+        """
+        self.__set(WALL_UP)
+        
+    def set_wall_down(self):
+        """
+        Sets the bottom wall of the cell.
+        """
+        self.__set(WALL_DOWN)
+        
+    def set_wall_right(self):
+        """
+        Sets the right wall of the cell.
+        """
+        self.__set(WALL_RIGHT)
+        
+    def set_wall_left(self):
+        """
+        Sets the left wall of the cell.
+        """
+        self.__set(WALL_LEFT)
+        
+    def unset_wall_up(self):
+        """
+        Unsets the top wall of the cell.
+        """
+        self.__unset(WALL_UP)
+        
+    def unset_wall_down(self):
+        """
+        Unsets the bottom wall of the cell.
+        """
+        self.__unset(WALL_DOWN)
+        
+    def unset_wall_right(self):
+        """
+        Unsets the right wall of the cell.
+        """
+        self.__unset(WALL_RIGHT)
+        
+    def unset_wall_left(self):
+        """
+        Unsets the left wall of the cell.
+        """
+        self.__unset(WALL_LEFT)
+        
+    def get_walls(self):
+        """
+        Returns a list of booleans representing the presence of the four walls.
+        They are ordered clockwise in the list: (up, right, down, left).
+        
+        :return: a list of four boolean values
+        :rtype: list
+        :UC: None
+        
+        Examples:
+        >>> c = CellView(bytearray([WALL_RIGHT | WALL_LEFT]), VisitedStamps(1), 0)
+        >>> c.get_walls()
+        [False, True, False, True]
+        """
+        flags = self.__cells[self.__index]
+        return [flags & WALL_UP != 0, flags & WALL_RIGHT != 0, flags & WALL_DOWN != 0, flags & WALL_LEFT != 0]
+        
+    def set_visited(self):
+        """
+        Sets the cell as visited.
+        """
+        self.__visited.visit(self.__index)
+        
+    def reset_visited(self):
+        """
+        Sets the cell as not visited.
+        """
+        self.__visited.unvisit(self.__index)
+        
+    def is_visited(self):
+        """
+        Returns True if the cell has been visited, False if not.
+        """
+        return self.__visited.is_visited(self.__index)
@@ -0,0 +1,191 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+:mod:`distance_oracle` module : class DistanceOracle used to answer distance queries in a perfect maze.
+
+:author: `BART Sébastien / ELABDALLAH Mohammed / KROL Mikolaï`
+
+:date: 2018, november.
+
+A perfect maze is a tree. Once it is rooted, the distance between two cells is
+depth(a) + depth(b) - 2 * depth(c) where c is their lowest common ancestor. The
+lowest common ancestor is the cell of minimal depth between the first visits of a
+and b in an Euler tour of the tree. The tour is cut in blocks of BLOCK_SIZE items :
+the minimum of the whole blocks between a and b is found in constant time with a
+sparse table of the minimums of all the ranges of 2**k blocks, and the minimums of
+the two partial blocks at the ends are computed on slices of the tour. The table
+has about 2n/BLOCK_SIZE * log(n) items for n cells, so the oracle takes about
+40 bytes per cell (40 MB for a 1000x1000 maze).
+
+
+"""
+
+from array import array
+from class_Cell import *
+
+
+# number of items of the tour in a block
+BLOCK_SIZE = 32
+
+
+class DistanceOracle(object):
+    """
+    Creates a distance oracle for a perfect maze.
+
+    >>> from perfect_maze import perfect_maze
+    >>> from solvers import bfs_path
+    >>> maze = perfect_maze(8, 6, 'kruskal', 3)
+    >>> oracle = DistanceOracle(maze)
+    >>> oracle.distance((0, 0), (7, 5)) == len(bfs_path(maze, (0, 0), (7, 5))) - 1
+    True
+    >>> oracle.path((3, 4), (6, 1)) == bfs_path(maze, (3, 4), (6, 1))
+    True
+    >>> oracle.distance((2, 2), (2, 2))
+    0
+    """
+
+    def __init__(self, maze, root=(0, 0)):
+        """
+        Roots the tree of the cells of maze at root and builds its Euler tour and the sparse
+        table of the minimums of its blocks, in time and memory proportional to n for n cells.
+
+        :param maze: a perfect maze, it must not be modified while the oracle is used
+        :type maze: Maze
+        :param root: coordinates of the root cell
+        :type root: tuple
+        :return: a distance oracle
+        :rtype: DistanceOracle
+        :UC: maze is perfect
+        """
+        width = maze.get_width()
+        cells = maze.get_cells()
+        neighbors = maze.get_neighbors()
+        size = len(cells)
+        source = root[1] * width + root[0]
+        parents = array('i', [-1]) * size
+        depths = array('i', [0]) * size
+        firsts = array('i', [-1]) * size
+        next_directions = bytearray(size)
+        # each item of the tour is depth * size + cell, so the minimum is the cell of minimal depth
+        tour = array('q', [source])
+        parents[source] = source
+        firsts[source] = 0
+        stack = [source]
+        while stack:
+            index = stack[-1]
+            directions = OPEN_DIRECTIONS[cells[index]]
+            child = -1
+            while child < 0 and next_directions[index] < len(directions):
+                neighbor = neighbors[directions[next_directions[index]]][index]
+                next_directions[index] += 1
+                if neighbor >= 0 and firsts[neighbor] < 0:
+                    child = neighbor
+            if child >= 0:
+                parents[child] = index
+                depths[child] = depths[index] + 1
+                firsts[child] = len(tour)
+                tour.append(depths[child] * size + child)
+                stack.append(child)
+            else:
+                stack.pop()
+                if stack:
+                    tour.append(depths[stack[-1]] * size + stack[-1])
+        # the level k of the table gives the minimum of the 2**k blocks from each block
+        table = [array('q', (min(tour[start:start + BLOCK_SIZE]) for start in range(0, len(tour), BLOCK_SIZE)))]
+        length = 1
+        while 2 * length <= len(table[0]):
+            previous = table[-1]
+            table.append(array('q', map(min, previous, previous[length:])))
+            length *= 2
+        self.__width = width
+        self.__size = size
+        self.__parents = parents
+        self.__depths = depths
+        self.__firsts = firsts
+        self.__tour = tour
+        self.__table = table
+
+    def __ancestor(self, index1, index2):
+        first1 = self.__firsts[index1]
+        first2 = self.__firsts[index2]
+        if first1 > first2:
+            first1, first2 = first2, first1
+        tour = self.__tour
+        # the whole blocks between first1 and first2 are the blocks block1 to block2-1
+        block1 = first1 // BLOCK_SIZE + 1
+        block2 = first2 // BLOCK_SIZE
+        if block1 > block2:
+            return min(tour[first1:first2 + 1]) % self.__size
+        best = min(min(tour[first1:block1 * BLOCK_SIZE]), min(tour[block2 * BLOCK_SIZE:first2 + 1]))
+        if block1 < block2:
+            level = (block2 - block1).bit_length() - 1
+            row = self.__table[level]
+            best = min(best, row[block1], row[block2 - (1 << level)])
+        return best % self.__size
+
+    def ancestor(self, cell1, cell2):
+        """
+        Returns the lowest common ancestor of cell1 and cell2 in the tree rooted at the root.
+
+        :param cell1: coordinates of a cell
+        :type cell1: tuple
+        :param cell2: coordinates of a cell
+        :type cell2: tuple
+        :return: coordinates of their lowest common ancestor
+        :rtype: tuple
+
+        :Examples:
+        >>> from class_Maze import Maze
+        >>> maze = Maze(3, 1)
+        >>> DistanceOracle(maze, (1, 0)).ancestor((0, 0), (2, 0))
+        (1, 0)
+        """
+        width = self.__width
+        index = self.__ancestor(cell1[1] * width + cell1[0], cell2[1] * width + cell2[0])
+        return (index % width, index // width)
+
+    def distance(self, cell1, cell2):
+        """
+        Returns the length of the path between cell1 and cell2, in constant time.
+
+        :param cell1: coordinates of a cell
+        :type cell1: tuple
+        :param cell2: coordinates of a cell
+        :type cell2: tuple
+        :return: the number of moves from cell1 to cell2
+        :rtype: int
+        """
+        width = self.__width
+        index1 = cell1[1] * width + cell1[0]
+        index2 = cell2[1] * width + cell2[0]
+        depths = self.__depths
+        return depths[index1] + depths[index2] - 2 * depths[self.__ancestor(index1, index2)]
+
+    def path(self, cell1, cell2):
+        """
+        Returns the path from cell1 to cell2, in time proportional to its length.
+
+        :param cell1: coordinates of a cell
+        :type cell1: tuple
+        :param cell2: coordinates of a cell
+        :type cell2: tuple
+        :return: the coordinates of the cells of the path
+        :rtype: list
+        """
+        width = self.__width
+        parents = self.__parents
+        index1 = cell1[1] * width + cell1[0]
+        index2 = cell2[1] * width + cell2[0]
+        ancestor = self.__ancestor(index1, index2)
+        path = []
+        while index1 != ancestor:
+            path.append((index1 % width, index1 // width))
+            index1 = parents[index1]
+        path.append((ancestor % width, ancestor // width))
+        end = []
+        while index2 != ancestor:
+            end.append((index2 % width, index2 // width))
+            index2 = parents[index2]
+        path.extend(reversed(end))
+        return path
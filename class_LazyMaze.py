@@ -0,0 +1,409 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+:mod:`lazy_maze` module : class LazyMaze used to read a maze too big for the memory from its file.
+
+:author: `BART Sébastien / ELABDALLAH Mohammed / KROL Mikolaï`
+
+:date: 2018, november.
+
+The file is mapped in memory with mmap and cut in blocks of rows. A block is
+decoded the first time one of its cells is read and kept in a bounded LRU of
+blocks, so only a few blocks are in memory at once. The file is either in the
+binary format of binary_maze.py, whose rows start at known offsets, or in the
+format written by Maze.to_txt, whose lines are indexed once when it is opened.
+
+A LazyMaze has the methods get_cells, get_neighbors, get_width and get_height
+used by the solvers of solvers.py, so they work on it unchanged : get_cells returns
+a LazyCells object reading the flags of the cells through the blocks, and
+get_neighbors returns the table of class_Maze.neighbor_table, which computes the
+positions of the neighbors instead of storing them. The solvers of solvers.py still
+keep their own arrays for all the cells (12 bytes per cell), more than a Maze in
+memory : LazyMaze.find_path uses by default its own breadth-first search, which keeps
+the parents of the cells only for the blocks it reaches (4 bytes per cell of these
+blocks). A LazyMaze is read only.
+
+
+"""
+
+import mmap
+import threading
+from array import array
+from collections import OrderedDict, deque
+from class_Cell import *
+from class_Maze import wall_flags, neighbor_table
+import binary_maze
+import txt_to_maze
+import solvers
+
+
+class LazyCells(object):
+    """
+    Creates the flags of the cells of a LazyMaze, read through its blocks.
+    Behaves like the bytearray returned by Maze.get_cells, but can't be modified.
+    """
+
+    def __init__(self, maze):
+        """
+        :param maze: the maze
+        :type maze: LazyMaze
+        :return: the flags of its cells
+        :rtype: LazyCells
+        """
+        self.__maze = maze
+        self.__size = maze.get_width() * maze.get_height()
+        self.__block_cells = maze.get_block_rows() * maze.get_width()
+        # the start, the end and the flags of the last block read, most of the reads are in
+        # the same block : they are replaced at once so concurrent reads see the same block
+        self.__last = (0, 0, b'')
+
+    def __len__(self):
+        return self.__size
+
+    def __getitem__(self, index):
+        start, end, flags = self.__last
+        if start <= index < end:
+            return flags[index - start]
+        if not 0 <= index < self.__size:
+            raise IndexError('cell index out of range')
+        block = index // self.__block_cells
+        flags = self.__maze.get_block(block)
+        start = block * self.__block_cells
+        self.__last = (start, start + len(flags), flags)
+        return flags[index - start]
+
+
+class LazyMaze(object):
+    """
+    Creates a maze read on demand from its file.
+
+    >>> import os, tempfile
+    >>> from perfect_maze import perfect_maze
+    >>> from binary_maze import write_binary
+    >>> maze = perfect_maze(30, 20, 'kruskal', 4)
+    >>> folder = tempfile.TemporaryDirectory()
+    >>> write_binary(maze, os.path.join(folder.name, 'maze.bin'))
+    >>> maze.to_txt(os.path.join(folder.name, 'maze.txt'))
+    >>> for name in ('maze.bin', 'maze.txt'):
+    ...     lazy = LazyMaze(os.path.join(folder.name, name), block_rows=4, max_blocks=2)
+    ...     print(lazy.find_path((0, 0), (29, 19)) == maze.find_path((0, 0), (29, 19)))
+    ...     print(lazy.is_there_a_wall((3, 5), (4, 5)) == maze.is_there_a_wall((3, 5), (4, 5)))
+    ...     lazy.close()
+    True
+    True
+    True
+    True
+    >>> folder.cleanup()
+    """
+
+    def __init__(self, file, block_rows=64, max_blocks=16):
+        """
+        Opens the maze stored in file, in the binary format or in the text format.
+        Only the header of the file is read, and the positions of its lines for the text format.
+
+        :param file: the name of the file
+        :type file: str
+        :param block_rows: the number of rows of a block
+        :type block_rows: int
+        :param max_blocks: the maximum number of blocks kept in memory
+        :type max_blocks: int
+        :return: the maze
+        :rtype: LazyMaze
+        :raise ValueError: if file is not a maze or is truncated
+        :UC: block_rows and max_blocks > 0
+        """
+        with open(file, 'rb') as in_stream:
+            self.__mapped = mmap.mmap(in_stream.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.__index()
+        except ValueError:
+            self.__mapped.close()
+            raise
+        self.__block_rows = block_rows
+        self.__max_blocks = max_blocks
+        self.__blocks = OrderedDict()
+        # protects the blocks and their counters, the blocks are decoded outside of it
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__cells = LazyCells(self)
+        self.__neighbors = neighbor_table(self.__width, self.__height)
+
+    def __index(self):
+        mapped = self.__mapped
+        if mapped[:len(binary_maze.MAGIC)] == binary_maze.MAGIC:
+            self.__width, self.__height, flags = binary_maze.read_header(mapped)
+            self.__lines = None
+            return
+        # the positions of the starts of the lines, and of the end of the last one
+        lines = array('q', [0])
+        position = mapped.find(b'\n')
+        while position >= 0:
+            lines.append(position + 1)
+            position = mapped.find(b'\n', position + 1)
+        if lines[-1] < len(mapped):
+            lines.append(len(mapped) + 1)
+        if len(lines) < 3:
+            raise ValueError('not a maze')
+        self.__width = int(mapped[lines[0]:lines[1]])
+        self.__height = int(mapped[lines[1]:lines[2]])
+        self.__lines = lines
+        if len(lines) - 1 < 3 + 2 * self.__height:
+            raise ValueError('truncated maze: {:d} lines instead of {:d}'.format(len(lines) - 1, 3 + 2 * self.__height))
+
+    def __line(self, number):
+        return self.__mapped[self.__lines[number]:self.__lines[number + 1] - 1].rstrip(b'\r')
+
+    def __decode(self, first, last):
+        if self.__lines is None:
+            return binary_maze.decode_rows(self.__mapped, first, last)
+        width = self.__width
+        rows = [self.__line(3 + 2 * y) for y in range(first, last)]
+        bottoms = [self.__line(4 + 2 * y) for y in range(first, last)]
+        rights, downs = txt_to_maze.row_walls(rows, bottoms, width)
+        if last == self.__height:
+            downs = downs[:-width] + b'\x01' * width
+        if first == 0:
+            above = b'\x01' * width
+        else:
+            above = txt_to_maze.row_walls([], [self.__line(2 + 2 * first)], width)[1]
+        return wall_flags(width, rights, downs, above)
+
+    def get_block(self, block):
+        """
+        Returns the flags of the cells of the block of rows number block, decoding it if it
+        is not in memory. The least recently used block is forgotten when there are too many.
+        Several threads can read the blocks at once.
+
+        :param block: the number of the block
+        :type block: int
+        :return: the flags of the cells of the block
+        :rtype: bytes
+        :UC: 0 <= block < the number of blocks
+
+        :Examples:
+        >>> import os, tempfile
+        >>> from concurrent.futures import ThreadPoolExecutor
+        >>> from perfect_maze import perfect_maze
+        >>> from binary_maze import write_binary
+        >>> maze = perfect_maze(50, 200, 'kruskal', 1)
+        >>> with tempfile.TemporaryDirectory() as folder:
+        ...     write_binary(maze, os.path.join(folder, 'maze.bin'))
+        ...     lazy = LazyMaze(os.path.join(folder, 'maze.bin'), block_rows=1, max_blocks=2)
+        ...     with ThreadPoolExecutor(8) as executor:
+        ...         copies = list(executor.map(lambda i: bytes(lazy.get_cells()[index] for index in range(10000)), range(8)))
+        ...     lazy.close()
+        >>> all(copy == maze.get_cells() for copy in copies)
+        True
+        """
+        blocks = self.__blocks
+        with self.__lock:
+            flags = blocks.get(block)
+            if flags is not None:
+                self.__hits += 1
+                blocks.move_to_end(block)
+                return flags
+            self.__misses += 1
+        first = block * self.__block_rows
+        flags = self.__decode(first, min(self.__height, first + self.__block_rows))
+        with self.__lock:
+            blocks[block] = flags
+            blocks.move_to_end(block)
+            if len(blocks) > self.__max_blocks:
+                blocks.popitem(last=False)
+                self.__evictions += 1
+        return flags
+
+    def get_block_rows(self):
+        """
+        :return: the number of rows of a block
+        :rtype: int
+        """
+        return self.__block_rows
+
+    def get_width(self):
+        """
+        :return: the width of the maze
+        :rtype: int
+        """
+        return self.__width
+
+    def get_height(self):
+        """
+        :return: the height of the maze
+        :rtype: int
+        """
+        return self.__height
+
+    def get_cells(self):
+        """
+        Returns the flags of the cells, row after row, read through the blocks.
+
+        :return: the flags of the cells
+        :rtype: LazyCells
+        """
+        return self.__cells
+
+    def get_neighbors(self):
+        """
+        Returns the table of the neighbors of the cells, see class_Maze.neighbor_table.
+
+        :return: the table of the neighbors
+        :rtype: tuple
+        """
+        return self.__neighbors
+
+    def get_cell(self, x, y):
+        """
+        Returns a copy of the cell of coordinates (x,y) : modifying it doesn't modify the maze.
+
+        :param x: x-coordinate of a cell
+        :type x: int
+        :param y: y-coordinate of a cell
+        :type y: int
+        :return: the cell
+        :rtype: CellView
+
+        :UC: 0 <= x < width and 0 <= y < height
+        """
+        return CellView(bytearray([self.__cells[y * self.__width + x]]), VisitedStamps(1), 0)
+
+    def is_there_a_wall(self, tuple1, tuple2):
+        """
+        Returns True if there is a wall between the cell of coordinates tuple1 and its neighbor
+        of coordinates tuple2, False if not.
+
+        :param tuple1: (x,y) coordinates of a cell
+        :type tuple1: tuple
+        :param tuple2: (x,y) coordinates of a neighbor of the cell of coordinates tuple1
+        :type tuple2: tuple
+        :return: True if there is a wall
+        :rtype: bool
+        """
+        (x1, y1) = tuple1
+        (x2, y2) = tuple2
+        flags = self.__cells[y1 * self.__width + x1]
+        if x2 < x1:
+            return bool(flags & WALL_LEFT)
+        elif x2 > x1:
+            return bool(flags & WALL_RIGHT)
+        elif y2 < y1:
+            return bool(flags & WALL_UP)
+        return bool(flags & WALL_DOWN)
+
+    def find_path(self, start=(0, 0), goal=None, algorithm='bfs'):
+        """
+        Returns a shortest path from start to goal, see Maze.find_path. The breadth-first
+        search 'bfs' keeps the parents of the cells only for the blocks it reaches, the
+        other algorithms of solvers.SOLVERS keep arrays of 12 bytes for all the cells.
+
+        :param start: coordinates of the first cell of the path
+        :type start: tuple
+        :param goal: coordinates of the last cell of the path, the bottom right cell if None
+        :type goal: tuple
+        :param algorithm: the name of the algorithm, a key of solvers.SOLVERS
+        :type algorithm: str
+        :return: the coordinates of the cells of the path, None if there is no path
+        :rtype: list
+
+        :Examples:
+        >>> import os, tempfile
+        >>> from class_Maze import Maze
+        >>> from binary_maze import write_binary
+        >>> maze = Maze(6, 8)
+        >>> for x in range(6):
+        ...     maze.build_walls_down(x, 3)
+        >>> folder = tempfile.TemporaryDirectory()
+        >>> path = os.path.join(folder.name, 'maze.bin')
+        >>> write_binary(maze, path)
+        >>> lazy = LazyMaze(path, block_rows=2)
+        >>> lazy.find_path((0, 0), (5, 1)) == maze.find_path((0, 0), (5, 1))
+        True
+        >>> lazy.find_path((0, 0), (0, 7)) is None
+        True
+        >>> lazy.stats()['blocks']
+        2
+        >>> lazy.close()
+        >>> folder.cleanup()
+        """
+        if goal is None:
+            goal = (self.__width - 1, self.__height - 1)
+        if algorithm != 'bfs':
+            return solvers.find_path(self, start, goal, algorithm)
+        width = self.__width
+        block_cells = self.__block_rows * width
+        cells = self.__cells
+        neighbors = self.__neighbors
+        source = start[1] * width + start[0]
+        target = goal[1] * width + goal[0]
+        unreached = array('i', [-1]) * block_cells
+        # the parents of the cells of each block reached, -1 for the cells not reached
+        parents = {source // block_cells: unreached[:]}
+        parents[source // block_cells][source % block_cells] = source
+        queue = deque([source])
+        while queue:
+            index = queue.popleft()
+            if index == target:
+                path = [(index % width, index // width)]
+                while index != source:
+                    index = parents[index // block_cells][index % block_cells]
+                    path.append((index % width, index // width))
+                path.reverse()
+                return path
+            for direction in OPEN_DIRECTIONS[cells[index]]:
+                neighbor = neighbors[direction][index]
+                if neighbor >= 0:
+                    block = neighbor // block_cells
+                    if block not in parents:
+                        parents[block] = unreached[:]
+                    reached = parents[block]
+                    if reached[neighbor % block_cells] < 0:
+                        reached[neighbor % block_cells] = index
+                        queue.append(neighbor)
+        return None
+
+    def stats(self):
+        """
+        Returns the counters of the blocks : the number of blocks found in memory (hits),
+        decoded (misses) and forgotten (evictions), the hit rate and the number of blocks
+        in memory. The reads of the cells of the last block read are not counted.
+
+        :return: the counters
+        :rtype: dict
+
+        :Examples:
+        >>> import os, tempfile
+        >>> from class_Maze import Maze
+        >>> from binary_maze import write_binary
+        >>> folder = tempfile.TemporaryDirectory()
+        >>> path = os.path.join(folder.name, 'maze.bin')
+        >>> write_binary(Maze(4, 10), path)
+        >>> lazy = LazyMaze(path, block_rows=2, max_blocks=2)
+        >>> cells = lazy.get_cells()
+        >>> for index in (0, 9, 1, 39, 2, 30):
+        ...     flags = cells[index]
+        >>> stats = lazy.stats()
+        >>> stats['hits'], stats['misses'], stats['evictions'], stats['blocks'], round(stats['hit_rate'], 2)
+        (2, 4, 2, 2, 0.33)
+        >>> lazy.close()
+        >>> folder.cleanup()
+        """
+        with self.__lock:
+            lookups = self.__hits + self.__misses
+            return {'hits': self.__hits,
+                    'misses': self.__misses,
+                    'evictions': self.__evictions,
+                    'hit_rate': self.__hits / lookups if lookups else 0.0,
+                    'blocks': len(self.__blocks)}
+
+    def close(self):
+        """
+        Closes the file of the maze.
+
+        :return: None
+        """
+        with self.__lock:
+            self.__blocks.clear()
+        self.__mapped.close()
@@ -10,12 +10,224 @@
 
 Mazes are objects 
 
+The cells of a maze are stored in a single bytearray, one byte of flags per cell
+(see class_Cell), row after row, and their visited state in a VisitedStamps object.
+get_cell returns a CellView on them.
+
 
 """
 
+import os
+import struct
+import threading
 from random import *
 from class_Cell import *
 from stack import *
+from union_find import *
+from collections import OrderedDict
+import solvers
+
+_DISPLAY_OFF = bytes(flags & ~DISPLAY for flags in range(256))
+
+# characters of the representation of a cell, of its right wall and of its bottom wall
+_CENTER_CHARS = bytes(ord('x') if flags & DISPLAY else ord(' ') for flags in range(256))
+_RIGHT_CHARS = bytes(ord('|') if flags & WALL_RIGHT else ord(' ') for flags in range(256))
+_DOWN_CHARS = bytes(ord('-') if flags & WALL_DOWN else ord(' ') for flags in range(256))
+
+# translation of the bytes worth 0 or 1 into 0 or a wall flag
+_RIGHT_BITS = bytes([0, WALL_RIGHT]) + bytes(254)
+_LEFT_BITS = bytes([0, WALL_LEFT]) + bytes(254)
+_DOWN_BITS = bytes([0, WALL_DOWN]) + bytes(254)
+_UP_BITS = bytes([0, WALL_UP]) + bytes(254)
+
+
+class Neighbors(object):
+    """
+    Creates the positions of the neighbors of the cells of a maze in one direction,
+    computed when they are read instead of stored, so they take no memory per cell.
+    
+    Examples:
+    >>> list(Neighbors(EAST, 3, 2))
+    [1, 2, -1, 4, 5, -1]
+    >>> list(Neighbors(NORTH, 3, 2))
+    [-1, -1, -1, 0, 1, 2]
+    """
+    
+    def __init__(self, direction, width, height):
+        """
+        :param direction: NORTH, EAST, SOUTH or WEST
+        :type direction: int
+        :param width: width of the maze
+        :type width: int
+        :param height: height of the maze
+        :type height: int
+        :return: the neighbors in direction
+        :rtype: Neighbors
+        """
+        self.__direction = direction
+        self.__width = width
+        self.__size = width * height
+    
+    
+    def __len__(self):
+        return self.__size
+    
+    
+    def __iter__(self):
+        return map(self.__getitem__, range(self.__size))
+    
+    
+    def __getitem__(self, index):
+        direction = self.__direction
+        width = self.__width
+        if direction == NORTH:
+            return index - width if index >= width else -1
+        if direction == SOUTH:
+            return index + width if index + width < self.__size else -1
+        if direction == EAST:
+            return index + 1 if (index + 1) % width else -1
+        return index - 1 if index % width else -1
+
+
+def neighbor_table(width, height):
+    """
+    Returns the table of the neighbors of the cells of a maze of size width*height.
+    The positions are computed when they are read, see Neighbors.
+    
+    :param width: width of the maze
+    :type width: int
+    :param height: height of the maze
+    :type height: int
+    :return: for each direction, a sequence which item i is the position of the neighbor
+             of the cell at position i in this direction, -1 if there is none
+    :rtype: tuple
+    
+    :UC: width and height > 0
+    
+    Examples:
+    >>> [list(neighbors) for neighbors in neighbor_table(3, 2)]
+    [[-1, -1, -1, 0, 1, 2], [1, 2, -1, 4, 5, -1], [3, 4, 5, -1, -1, -1], [-1, 0, 1, -1, 3, 4]]
+    """
+    return tuple(Neighbors(direction, width, height) for direction in (NORTH, EAST, SOUTH, WEST))
+
+
+def random_generator(seed=None):
+    """
+    Returns the random generator used to build a maze from seed.
+    
+    :param seed: a seed or a random generator
+    :type seed: int, str, Random or NoneType
+    :return: seed if it is a random generator, a new random generator seeded with seed if not
+    :rtype: Random
+    
+    Examples:
+    >>> random_generator(4).random() == random_generator(4).random()
+    True
+    >>> rng = Random(4)
+    >>> random_generator(rng) is rng
+    True
+    """
+    if isinstance(seed, Random):
+        return seed
+    return Random(seed)
+
+
+def maze_from_bytes(data):
+    """
+    Returns the maze described by data, as written by Maze.to_bytes.
+    
+    :param data: the compact description of a maze
+    :type data: bytes
+    :return: the maze
+    :rtype: Maze
+    
+    Examples:
+    >>> maze = Maze(3, 2)
+    >>> maze.build_walls_down(1, 0)
+    >>> maze_from_bytes(maze.to_bytes())
+    +-+-+-+
+    |     |
+    + +-+ +
+    |     |
+    +-+-+-+
+    <BLANKLINE>
+    """
+    width, height = struct.unpack_from('<II', data)
+    maze = Maze(width, height)
+    maze.get_cells()[:] = data[8:8 + width * height]
+    return maze
+
+
+def wall_flags(width, rights, downs, above):
+    """
+    Returns the flags of the cells of consecutive rows of a maze from their right and
+    bottom walls. The left walls are the right walls of the previous cells and the top
+    walls are the bottom walls of the row above, so all the flags are computed at once with
+    bytes.translate and big integer operations. The left and right walls of the outline
+    are always set.
+    
+    :param width: width of the maze
+    :type width: int
+    :param rights: 1 for the cells with a right wall, 0 for the others, row after row
+    :type rights: bytes
+    :param downs: 1 for the cells with a bottom wall, 0 for the others, row after row
+    :type downs: bytes
+    :param above: the bottom walls of the row above the first row, all 1 for the top row of the maze
+    :type above: bytes
+    :return: the flags of the cells
+    :rtype: bytes
+    
+    :UC: len(rights) == len(downs) is a multiple of width, len(above) == width
+    
+    Examples:
+    >>> list(wall_flags(2, b'\\x00\\x00', b'\\x01\\x00', b'\\x01\\x01')) == [WALL_UP | WALL_LEFT | WALL_DOWN, WALL_UP | WALL_RIGHT]
+    True
+    """
+    size = len(rights)
+    rights = bytearray(rights)
+    rights[width - 1::width] = b'\x01' * (size // width)
+    lefts = b''.join(b'\x01' + rights[start:start + width - 1] for start in range(0, size, width))
+    ups = bytes(above) + bytes(downs[:size - width])
+    code = (int.from_bytes(rights.translate(_RIGHT_BITS), 'little') |
+            int.from_bytes(lefts.translate(_LEFT_BITS), 'little') |
+            int.from_bytes(bytes(downs).translate(_DOWN_BITS), 'little') |
+            int.from_bytes(ups.translate(_UP_BITS), 'little'))
+    return code.to_bytes(size, 'little')
+
+
+def maze_from_walls(width, height, rights, downs):
+    """
+    Returns the maze of size width*height with the given right and bottom walls, see
+    wall_flags. The walls of the outline are always set.
+    
+    :param width: width of the maze
+    :type width: int
+    :param height: height of the maze
+    :type height: int
+    :param rights: 1 for the cells with a right wall, 0 for the others, row after row
+    :type rights: bytes
+    :param downs: 1 for the cells with a bottom wall, 0 for the others, row after row
+    :type downs: bytes
+    :return: the maze
+    :rtype: Maze
+    
+    :UC: len(rights) == len(downs) == width*height
+    
+    Examples:
+    >>> maze_from_walls(3, 2, bytes([0, 1, 0, 0, 0, 0]), bytes([1, 0, 0, 0, 0, 0]))
+    +-+-+-+
+    |   | |
+    +-+ + +
+    |     |
+    +-+-+-+
+    <BLANKLINE>
+    """
+    downs = bytearray(downs)
+    downs[-width:] = b'\x01' * width
+    maze = Maze(width, height)
+    maze.get_cells()[:] = wall_flags(width, rights, downs, b'\x01' * width)
+    return maze
+
     
 class Maze():
     """
@@ -52,6 +264,9 @@ class Maze():
     <BLANKLINE>
     """
     
+    # maximum number of paths remembered by find_path
+    PATH_CACHE_SIZE = 256
+    
     def __init__(self, width, height):
         """
         Creates a maze of size width*height which none of the walls are set except the walls of the outline.
@@ -85,26 +300,201 @@ class Maze():
         """
         self.__height = height
         self.__width = width
-        self.__grid = [[Cell() for i in range(self.__width)] for j in range(self.__height)]
-        for cell in self.__grid[0]:
-            cell.set_wall_up()
-        for cell in self.__grid[-1]:
-            cell.set_wall_down()
-        for line in self.__grid:
-            line[0].set_wall_left()
-            line[-1].set_wall_right()
+        line = bytearray(width)
+        line[0] |= WALL_LEFT
+        line[-1] |= WALL_RIGHT
+        top = bytes(flags | WALL_UP for flags in line)
+        bottom = bytes(flags | WALL_DOWN for flags in line)
+        if height == 1:
+            self.__cells = bytearray(flags | WALL_DOWN for flags in top)
+        else:
+            self.__cells = bytearray(top + bytes(line) * (height - 2) + bottom)
+        self.__visited = VisitedStamps(width * height)
+        self.__neighbors = neighbor_table(width, height)
+        self.__version = 0
+        self.__paths = OrderedDict()
+        self.__path_hits = 0
+        self.__path_misses = 0
+        self.__listeners = []
+        self.__components = None
+        self.__components_version = -1
+        self.__lock = threading.Lock()
     
     
     def get_grid(self):
         """
-        Returns the maze's grid.
+        Returns the maze's grid, as a list of lines of views on the cells.
+        The views are created at each call, prefer get_cell or get_cells.
         
         :return: grid
         :rtype: list
         """
-        return self.__grid
+        cells = self.__cells
+        visited = self.__visited
+        width = self.__width
+        return [[CellView(cells, visited, y * width + x) for x in range(width)] for y in range(self.__height)]
+    
+    
+    def get_cells(self):
+        """
+        Returns the bytearray storing the flags of the cells, row after row.
+        The cell of coordinates (x,y) is at index y*width+x.
+        
+        :return: the flags of the cells
+        :rtype: bytearray
+        
+        Examples:
+        >>> maze = Maze(2, 2)
+        >>> list(maze.get_cells()) == [WALL_UP | WALL_LEFT, WALL_UP | WALL_RIGHT, WALL_DOWN | WALL_LEFT, WALL_DOWN | WALL_RIGHT]
+        True
+        """
+        return self.__cells
 
 
+    def get_neighbors(self):
+        """
+        Returns the table of the neighbors of the cells, see neighbor_table.
+        The neighbor of the cell at position i in the direction d is get_neighbors()[d][i],
+        the directions without a wall are OPEN_DIRECTIONS[get_cells()[i]] : looping over them
+        allocates nothing.
+        
+        :return: the table of the neighbors
+        :rtype: tuple
+        """
+        return self.__neighbors
+    
+    
+    def open_neighbors(self, index):
+        """
+        Yields the positions of the neighbors of the cell at position index which are not
+        separated from it by a wall.
+        
+        :param index: position of a cell
+        :type index: int
+        :return: the positions of the neighbors
+        :rtype: generator
+        
+        :UC: 0 <= index < maze.get_width()*maze.get_height()
+        
+        Examples:
+        >>> maze = Maze(3, 2)
+        >>> maze.build_walls_right(1, 0)
+        >>> list(maze.open_neighbors(1))
+        [4, 0]
+        """
+        neighbors = self.__neighbors
+        for direction in OPEN_DIRECTIONS[self.__cells[index]]:
+            neighbor = neighbors[direction][index]
+            if neighbor >= 0:
+                yield neighbor
+    
+    
+    def get_version(self):
+        """
+        Returns the version of the walls of self, increased by each build_walls_* and
+        delete_walls_* call. The paths found by find_path are remembered for one version.
+        
+        :return: the version
+        :rtype: int
+        
+        Examples:
+        >>> maze = Maze(2, 2)
+        >>> maze.get_version()
+        0
+        >>> maze.build_walls_up(1, 1)
+        >>> maze.get_version()
+        1
+        """
+        return self.__version
+    
+    
+    def bump_version(self):
+        """
+        Increases the version of the walls of self. Must be called after modifying the walls
+        through get_cell or get_cells, which don't change the version.
+        
+        :return: None
+        """
+        self.__version += 1
+    
+    
+    def add_listener(self, listener):
+        """
+        Subscribes listener to the changes of the walls of self : after each build_walls_* or
+        delete_walls_* call which builds or deletes a wall between two cells, listener is
+        called with the positions of these two cells.
+        The changes made through get_cell or get_cells are not notified.
+        
+        :param listener: the function called
+        :type listener: function
+        :return: None
+        
+        Examples:
+        >>> maze = Maze(3, 2)
+        >>> maze.add_listener(print)
+        >>> maze.build_walls_right(1, 0)
+        1 2
+        >>> maze.build_walls_right(1, 0)
+        >>> maze.build_walls_up(1, 0)
+        >>> maze.remove_listener(print)
+        >>> maze.delete_walls_right(1, 0)
+        """
+        self.__listeners.append(listener)
+    
+    
+    def remove_listener(self, listener):
+        """
+        Unsubscribes listener from the changes of the walls of self, see add_listener.
+        
+        :param listener: the function called
+        :type listener: function
+        :return: None
+        
+        :UC: listener has been added with add_listener
+        """
+        self.__listeners.remove(listener)
+    
+    
+    def __build_wall(self, index, direction):
+        self.__version += 1
+        cells = self.__cells
+        neighbor = self.__neighbors[direction][index]
+        changed = not cells[index] & WALLS[direction]
+        cells[index] |= WALLS[direction]
+        if neighbor >= 0:
+            cells[neighbor] |= OPPOSITE_WALLS[direction]
+        if neighbor < 0 or not changed:
+            self.__keep_components()
+        else:
+            for listener in self.__listeners:
+                listener(index, neighbor)
+    
+    
+    def __delete_wall(self, index, direction):
+        self.__version += 1
+        cells = self.__cells
+        neighbor = self.__neighbors[direction][index]
+        changed = cells[index] & WALLS[direction]
+        cells[index] &= ~WALLS[direction]
+        if neighbor >= 0:
+            cells[neighbor] &= ~OPPOSITE_WALLS[direction]
+            if self.__keep_components():
+                self.__components.union(index, neighbor)
+            if changed:
+                for listener in self.__listeners:
+                    listener(index, neighbor)
+        else:
+            self.__keep_components()
+    
+    
+    def __keep_components(self):
+        # the components of the previous version are kept if this change disconnects no cells
+        if self.__components_version == self.__version - 1:
+            self.__components_version = self.__version
+            return True
+        return False
+    
+    
     def get_height(self):
         """
         Returns the maze's height.
@@ -147,22 +537,25 @@ class Maze():
         >>> M.all_visited()
         False
         """
-        for line in self.get_grid():
-            for cell in line:
-                if not cell.is_visited():
-                    return False
-        return True
+        return self.__visited.count() == len(self.__cells)
     
     def reset_all_visited(self):
         """
-        Sets the attribute is_visited for each cell of the maze at False.
+        Sets all the cells of the maze as not visited, in constant time.
        
         :return: None
         :rtype: NoneType
+        
+        Examples:
+        >>> M = Maze(1, 1)
+        >>> M.get_cell(0, 0).set_visited()
+        >>> M.all_visited()
+        True
+        >>> M.reset_all_visited()
+        >>> M.all_visited()
+        False
         """
-        for line in self.get_grid():
-            for cell in line:
-                cell.reset_visited()
+        self.__visited.clear()
         
               
     def neighborhood(self,x, y):
@@ -192,17 +585,16 @@ class Maze():
         """
         assert x < self.get_width() and y < self.get_height()
         
-        l = [(x,y-1), (x+1,y), (x,y+1), (x-1,y)]
-        l2 = []
-        
-        for t in l:
-            
-            if 0 <= t[0] < self.get_width() and 0 <= t[1] < self.get_height():
-                l2 += [t]
-            
+        width = self.__width
+        index = y * width + x
+        l = []
+        for neighbors in self.__neighbors:
+            neighbor = neighbors[index]
+            if neighbor >= 0:
+                l.append((neighbor % width, neighbor // width))
             else:
-                l2 += [()]
-        return l2
+                l.append(())
+        return l
 
 
     def get_cell(self,x,y):
@@ -225,12 +617,12 @@ class Maze():
         >>> maze.get_cell(0,1).get_walls()
         [False, False, False, True]
         """
-        return self.get_grid()[y][x]
+        return CellView(self.__cells, self.__visited, y * self.__width + x)
 
        
     def build_walls_up(self,x,y):
         """
-        Builds the top wall in the cell of coordinate (x,y) by setting its attribute __wall_up at True, take into account the cell's top
+        Builds the top wall in the cell of coordinate (x,y) by setting the flag WALL_UP in its byte, take into account the cell's top
         neighbor by building its bottom wall.
         
         :param x: x-coordinate of the cell
@@ -263,17 +655,11 @@ class Maze():
         >>> maze.get_cell(1,1).get_walls()
         [True, False, False, False]
         """
-        self.get_cell(x, y).set_wall_up()
-        coor_neighbor = Maze.neighborhood(self, x, y)[0]
-        try:
-            neighbor = self.get_cell(coor_neighbor[0], coor_neighbor[1])
-            neighbor.set_wall_down()
-        except IndexError:
-            pass
+        self.__build_wall(y * self.__width + x, NORTH)
     
     def build_walls_right(self,x,y):
         """
-        Builds the right wall in the cell of coordinate (x,y) by setting its attribute __wall_right at True, take into account the cell's right
+        Builds the right wall in the cell of coordinate (x,y) by setting the flag WALL_RIGHT in its byte, take into account the cell's right
         neighbor by building its left wall.
         
         :param x: x-coordinate of a cell
@@ -306,18 +692,12 @@ class Maze():
         >>> maze.get_cell(2,1).get_walls()
         [False, False, False, True]
         """
-        self.get_cell(x, y).set_wall_right()
-        coor_neighbor = Maze.neighborhood(self, x, y)[1]
-        try:
-            neighbor = self.get_cell(coor_neighbor[0], coor_neighbor[1])
-            neighbor.set_wall_left()
-        except IndexError:
-            pass
+        self.__build_wall(y * self.__width + x, EAST)
              
         
     def build_walls_down(self,x,y):
         """
-        Builds the bottom wall in the cell of coordinate (x,y) by setting its attribute __wall_down at True, take into account the cell's bottom
+        Builds the bottom wall in the cell of coordinate (x,y) by setting the flag WALL_DOWN in its byte, take into account the cell's bottom
         neighbor by building its top wall.
         
         :param x: x-coordinate of the cell
@@ -350,18 +730,12 @@ class Maze():
         >>> maze.get_cell(1,2).get_walls()
         [True, False, False, False]
         """
-        self.get_cell(x,y).set_wall_down()
-        coor_neighbor = Maze.neighborhood(self, x, y)[2]
-        try:
-            neighbor = self.get_cell(coor_neighbor[0], coor_neighbor[1])
-            neighbor.set_wall_up()
-        except IndexError:
-            pass
+        self.__build_wall(y * self.__width + x, SOUTH)
         
         
     def build_walls_left(self,x,y):
         """
-        Builds the left wall in the cell of coordinate (x,y) by setting its attribute __wall_left at True, take into account the cell's left
+        Builds the left wall in the cell of coordinate (x,y) by setting the flag WALL_LEFT in its byte, take into account the cell's left
         neighbor by building its right wall.
         
         :param x: x-coordinate of a cell
@@ -393,18 +767,12 @@ class Maze():
         >>> maze.get_cell(0,1).get_walls()
         [False, True, False, True]
         """
-        self.get_cell(x,y).set_wall_left()
-        coor_neighbor = Maze.neighborhood(self,x, y)[3]
-        try:
-            neighbor = self.get_cell(coor_neighbor[0],coor_neighbor[1])
-            neighbor.set_wall_right()
-        except IndexError:
-            pass
+        self.__build_wall(y * self.__width + x, WEST)
 
 
     def delete_walls_up(self,x,y):
         """
-        Destroys the top wall in the cell of coordinate (x,y) by setting the attribute __wall_up at False, take into account the cell's top
+        Destroys the top wall in the cell of coordinate (x,y) by clearing the flag WALL_UP in its byte, take into account the cell's top
         neighbor by destroying its bottom wall.
         
         :param x: x-coordinate of a cell
@@ -434,18 +802,12 @@ class Maze():
         +-+-+-+-+-+
         <BLANKLINE>
         """
-        self.get_cell(x,y).unset_wall_up()
-        coor_neighbor = Maze.neighborhood(self,x, y)[0]
-        try:
-            neighbor = self.get_cell(coor_neighbor[0],coor_neighbor[1])
-            neighbor.unset_wall_down()
-        except IndexError:
-            pass
+        self.__delete_wall(y * self.__width + x, NORTH)
     
     
     def delete_walls_right(self,x,y):
         """
-        Destroys the right wall in the cell of coordinate (x,y) by setting the attribute __wall_right at False, take into account the cell's right
+        Destroys the right wall in the cell of coordinate (x,y) by clearing the flag WALL_RIGHT in its byte, take into account the cell's right
         neighbor by destroying its left wall.
         
         :param x: x-coordinate of a cell
@@ -475,17 +837,11 @@ class Maze():
         +-+-+-+-+-+
         <BLANKLINE>
         """
-        self.get_cell(x,y).unset_wall_right()
-        coor_neighbor = Maze.neighborhood(self,x, y)[1]
-        try:
-            neighbor = self.get_cell(coor_neighbor[0],coor_neighbor[1])
-            neighbor.unset_wall_left()
-        except IndexError:
-            pass
+        self.__delete_wall(y * self.__width + x, EAST)
         
     def delete_walls_down(self,x,y):
         """
-        Destroys the bottom wall in the cell of coordinate (x,y) by setting the attribute __wall_down at False, take into account the cell's bottom
+        Destroys the bottom wall in the cell of coordinate (x,y) by clearing the flag WALL_DOWN in its byte, take into account the cell's bottom
         neighbor by destroying its top wall.
         
         :param x: x-coordinate of a cell
@@ -515,17 +871,11 @@ class Maze():
         +-+-+-+-+-+
         <BLANKLINE>
         """
-        self.get_cell(x,y).unset_wall_down()
-        coor_neighbor=Maze.neighborhood(self,x, y)[2]
-        try:
-            neighbor=self.get_cell(coor_neighbor[0],coor_neighbor[1])
-            neighbor.unset_wall_up()
-        except IndexError:
-            pass
+        self.__delete_wall(y * self.__width + x, SOUTH)
         
     def delete_walls_left(self,x,y):
         """
-        Destroys the left wall in the cell of coordinate (x,y) by setting the attribute __wall_left at False, take into account the cell's left
+        Destroys the left wall in the cell of coordinate (x,y) by clearing the flag WALL_LEFT in its byte, take into account the cell's left
         neighbor by destroying its right wall.
         
         :param x: x-coordinate of a cell
@@ -555,13 +905,7 @@ class Maze():
         +-+-+-+-+-+
         <BLANKLINE>
         """
-        self.get_cell(x,y).unset_wall_left()
-        coor_neighbor=Maze.neighborhood(self,x, y)[3]
-        try:
-            neighbor=self.get_cell(coor_neighbor[0],coor_neighbor[1])
-            neighbor.unset_wall_right()
-        except IndexError:
-            pass
+        self.__delete_wall(y * self.__width + x, WEST)
                   
     
     
@@ -584,46 +928,93 @@ class Maze():
         +-+-+-+
         <BLANKLINE>
         """
-        repr = ''
-        line_haut = '+-' * self.get_width() + '+\n'
-        repr += line_haut
-        for y in range(self.get_height()):
-            line_intermediaire1 = '|'
-            line_intermediaire2 = '+'
-            for x in range(self.get_width()):
-                if self.get_grid()[y][x].get_walls()[1] and self.get_grid()[y][x].is_displayed():
-                    line_intermediaire1 += 'x|'
-                elif self.get_grid()[y][x].get_walls()[1]:
-                    line_intermediaire1 += ' |'
-                elif not self.get_grid()[y][x].get_walls()[1] and self.get_grid()[y][x].is_displayed():
-                    line_intermediaire1 += 'x '
-                else:
-                    line_intermediaire1 += '  '
-                if self.get_grid()[y][x].get_walls()[2]:
-                    line_intermediaire2 += '-+'
-                else:
-                    line_intermediaire2 += ' +'
-            repr += line_intermediaire1 + '\n' + line_intermediaire2 + '\n'
-        return repr
-            
+        return ''.join(self.text_rows())
+    
+    
+    def text_rows(self):
+        """
+        Yields the representation of self piece by piece : its top line, then the two lines
+        of each row. The characters of a row are computed at once from the flags of its cells
+        by bytes.translate, so only one row is held in memory.
+        
+        :return: the lines of the representation
+        :rtype: generator
+        
+        :Example:
+        
+        >>> maze = Maze(3, 2)
+        >>> maze.build_walls_down(0, 0)
+        >>> list(maze.text_rows())
+        ['+-+-+-+\\n', '|     |\\n+-+ + +\\n', '|     |\\n+-+-+-+\\n']
+        """
+        width = self.__width
+        cells = self.__cells
+        yield '+-' * width + '+\n'
+        line = bytearray(b'|') * (2 * width + 2)
+        line[-1] = ord('\n')
+        walls = bytearray(b'+') * (2 * width + 2)
+        walls[-1] = ord('\n')
+        for start in range(0, len(cells), width):
+            row = cells[start:start + width]
+            line[1:-1:2] = row.translate(_CENTER_CHARS)
+            line[2:-1:2] = row.translate(_RIGHT_CHARS)
+            walls[1:-1:2] = row.translate(_DOWN_CHARS)
+            yield (line + walls).decode('ascii')
+    
     
     def to_txt(self, file):
         """
-        Writes in the file in parameter the description of self.
+        Writes in the file in parameter the description of self, row by row through a
+        buffered stream : only one row of the description is held in memory.
         
-        :param file: the file name to be written in
-        :type file: str
+        :param file: the path of the file or the text stream to be written in
+        :type file: str, os.PathLike or file
         :return: None
+        
+        Examples:
+        >>> import io
+        >>> stream = io.StringIO()
+        >>> Maze(2, 1).to_txt(stream)
+        >>> print(stream.getvalue(), end='')
+        2
+        1
+        +-+-+
+        |   |
+        +-+-+
+        >>> import pathlib, tempfile
+        >>> folder = tempfile.TemporaryDirectory()
+        >>> path = pathlib.Path(folder.name, 'maze.txt')
+        >>> Maze(2, 1).to_txt(path)
+        >>> path.read_text() == stream.getvalue()
+        True
+        >>> folder.cleanup()
+        """
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, 'w', buffering=2**20) as out_stream:
+                self.to_txt(out_stream)
+            return
+        file.write(str(self.__width) + '\n')
+        file.write(str(self.__height) + '\n')
+        for text in self.text_rows():
+            file.write(text)
+    
+    
+    def to_bytes(self):
         """
-        height = self.get_height()
-        width = self.get_width()
-        with open(file, 'w') as out_stream:
-            out_stream.write(str(width) + '\n')
-            out_stream.write(str(height) + '\n')
-            out_stream.write(str(self))                 
+        Returns a compact description of self : its width and height followed by the
+        flags of its cells. The visited state of the cells is not kept.
+        
+        :return: the description of self, read by maze_from_bytes
+        :rtype: bytes
+        
+        Examples:
+        >>> len(Maze(3, 2).to_bytes())
+        14
+        """
+        return struct.pack('<II', self.__width, self.__height) + self.__cells
                     
         
-    def choose_unvisited_random_neighbor(self,x,y):
+    def choose_unvisited_random_neighbor(self,x,y,rng=None):
         """
         Returns the coordinates of a random and unvisited neighbor of the cell of coordinates (x,y).
         If the cell has no unvisited neighbor, it returns an empty tuple.
@@ -632,6 +1023,8 @@ class Maze():
         :type x: int
         :param y: y-coordinate of a cell
         :type y: int
+        :param rng: the random generator used, the one of the module random if None
+        :type rng: Random
         :return: a tuple of coordinates
         :rtype: tuple
         
@@ -644,15 +1037,19 @@ class Maze():
         >>> maze.choose_unvisited_random_neighbor(0,0)
         ()
         """
-        neighbor = self.neighborhood(x,y)
+        width = self.__width
+        index = y * width + x
         possibilities = []
-        for elem in neighbor:
-            if elem != () and not self.get_cell(elem[0],elem[1]).is_visited():
-                possibilities.append(elem)
+        for neighbors in self.__neighbors:
+            neighbor = neighbors[index]
+            if neighbor >= 0 and not self.__visited.is_visited(neighbor):
+                possibilities.append((neighbor % width, neighbor // width))
         if possibilities == []:
             return ()
-        else:
+        elif rng is None:
             return choice(possibilities)
+        else:
+            return rng.choice(possibilities)
         
     
     def is_there_a_wall(self, tuple1, tuple2):
@@ -700,42 +1097,231 @@ class Maze():
         
         :UC: 0 <= x < maze.get_width() and 0 <= y < maze.get_height()
         """
-        neighbors = self.neighborhood(x, y)
+        width = self.__width
+        index = y * width + x
         possibilities = []
-        for elem in neighbors:
-            if elem != () and not self.get_cell(elem[0],elem[1]).is_visited():
-                if not self.is_there_a_wall((x,y), elem):
-                    possibilities.append(elem)
+        for direction in OPEN_DIRECTIONS[self.__cells[index]]:
+            neighbor = self.__neighbors[direction][index]
+            if neighbor >= 0 and not self.__visited.is_visited(neighbor):
+                possibilities.append((neighbor % width, neighbor // width))
         if possibilities == []:
             return ()
         else:
             return choice(possibilities)
   
                 
-    def solve(self):
-        """
-        Returns the maze self with the solution displayed if there is one, returns "No solution..." if not.
-        
-        :return: the maze with the solution displayed or "No solution..."
-        :rtype: Maze or str
-        """
-        x, y = 0, 0
-        stack = Stack()
-        stack.push((x,y))
-        while (x,y) != (self.get_width()-1, self.get_height()-1):
-            self.get_cell(x,y).set_visited()
-            self.get_cell(x,y).display_on()
-            next_coor = self.choose_possible_move(x,y)
-            if next_coor != ():
-                stack.push((x,y))
-                x, y = next_coor
+    def find_path(self, start=(0, 0), goal=None, algorithm='bfs'):
+        """
+        Returns a shortest path from start to goal, without modifying self.
+        The last PATH_CACHE_SIZE paths found for the current version of the walls are
+        remembered, so asking again for one of them costs a dictionary lookup.
+        Several threads can call find_path at once on the same maze, as long as no thread
+        modifies its walls or calls solve meanwhile.
+        
+        :param start: coordinates of the first cell of the path
+        :type start: tuple
+        :param goal: coordinates of the last cell of the path, the bottom right cell if None
+        :type goal: tuple
+        :param algorithm: the name of the algorithm used, a key of solvers.SOLVERS
+        :type algorithm: str
+        :return: the coordinates of the cells of the path, None if there is no path
+        :rtype: list
+        
+        :UC: start and goal are coordinates of cells of the maze
+        
+        Examples:
+        >>> maze = Maze(3, 2)
+        >>> maze.build_walls_down(1, 0)
+        >>> maze.find_path((1, 0), (1, 1))
+        [(1, 0), (2, 0), (2, 1), (1, 1)]
+        >>> maze.delete_walls_down(1, 0)
+        >>> maze.find_path((1, 0), (1, 1))
+        [(1, 0), (1, 1)]
+        """
+        if goal is None:
+            goal = (self.__width - 1, self.__height - 1)
+        key = (start, goal, algorithm, self.__version)
+        paths = self.__paths
+        with self.__lock:
+            found = key in paths
+            if found:
+                self.__path_hits += 1
+                paths.move_to_end(key)
+                path = paths[key]
             else:
-                self.get_cell(x,y).display_off()
-                try:
-                    (x,y) = stack.pop()
-                except StackEmptyError:
-                    return "No solution..."
-        self.get_cell(x,y).display_on()
+                self.__path_misses += 1
+        if not found:
+            # the search runs outside the lock, so several threads can search at once
+            path = solvers.find_path(self, start, goal, algorithm)
+            if path is not None:
+                path = tuple(path)
+            with self.__lock:
+                paths[key] = path
+                if len(paths) > self.PATH_CACHE_SIZE:
+                    paths.popitem(last=False)
+        if path is None:
+            return None
+        return list(path)
+    
+    
+    def path_cache_stats(self):
+        """
+        Returns the counters of the paths remembered by find_path : the number of hits and
+        misses, the hit rate and the number of paths remembered.
+        
+        :return: the counters
+        :rtype: dict
+        
+        Examples:
+        >>> maze = Maze(3, 3)
+        >>> for i in range(4):
+        ...     path = maze.find_path()
+        >>> maze.build_walls_right(0, 0)
+        >>> path = maze.find_path()
+        >>> maze.path_cache_stats()
+        {'hits': 3, 'misses': 2, 'hit_rate': 0.6, 'size': 2}
+        """
+        queries = self.__path_hits + self.__path_misses
+        return {'hits': self.__path_hits,
+                'misses': self.__path_misses,
+                'hit_rate': self.__path_hits / queries if queries else 0.0,
+                'size': len(self.__paths)}
+    
+    
+    def connected(self, cell1, cell2):
+        """
+        Returns True if there is a path between cell1 and cell2, False otherwise.
+        The components of the cells are computed in one pass over the cells the first time,
+        then kept up to date by delete_walls_* : they are only computed again after a wall
+        has been built between two cells or after bump_version.
+        
+        :param cell1: coordinates of a cell
+        :type cell1: tuple
+        :param cell2: coordinates of a cell
+        :type cell2: tuple
+        :return: True if cell1 and cell2 are connected
+        :rtype: bool
+        
+        :UC: cell1 and cell2 are cells of self
+        
+        Examples:
+        >>> maze = Maze(3, 2)
+        >>> maze.build_walls_right(1, 0)
+        >>> maze.build_walls_right(1, 1)
+        >>> maze.connected((0, 0), (2, 1))
+        False
+        >>> maze.delete_walls_right(1, 1)
+        >>> maze.connected((0, 0), (2, 1))
+        True
+        >>> maze.component_count()
+        1
+        """
+        width = self.__width
+        with self.__lock:
+            return self.__get_components().connected(cell1[1] * width + cell1[0], cell2[1] * width + cell2[0])
+    
+    
+    def component_count(self):
+        """
+        Returns the number of sets of cells connected by paths, see connected.
+        
+        :return: the number of components
+        :rtype: int
+        
+        Examples:
+        >>> Maze(3, 2).component_count()
+        1
+        """
+        with self.__lock:
+            return self.__get_components().count()
+    
+    
+    def __get_components(self):
+        if self.__components_version != self.__version:
+            cells = self.__cells
+            east = self.__neighbors[EAST]
+            south = self.__neighbors[SOUTH]
+            components = UnionFind(len(cells))
+            for index in range(len(cells)):
+                flags = cells[index]
+                if not flags & WALL_RIGHT and east[index] >= 0:
+                    components.union(index, east[index])
+                if not flags & WALL_DOWN and south[index] >= 0:
+                    components.union(index, south[index])
+            self.__components = components
+            self.__components_version = self.__version
+        return self.__components
+    
+    
+    def solve_many(self, pairs):
+        """
+        Yields a shortest path for each (start, goal) pair of pairs, with one search for each
+        distinct start, see solvers.solve_many. The results come grouped by start.
+        
+        :param pairs: the (start, goal) pairs of coordinates of cells
+        :type pairs: iterable
+        :return: the (start, goal, path) triples, path is None if there is no path
+        :rtype: generator
+        
+        Examples:
+        >>> maze = Maze(3, 3)
+        >>> [len(path) for start, goal, path in maze.solve_many([((0, 0), (2, 2)), ((1, 1), (1, 1)), ((0, 0), (2, 0))])]
+        [5, 3, 1]
+        """
+        return solvers.solve_many(self, pairs)
+    
+    
+    def solve(self, start=(0, 0), goal=None, display=True, algorithm='bfs'):
+        """
+        Returns the maze self with a shortest path from start to goal displayed if there is one,
+        returns "No solution..." if not. The path displayed by a previous call is erased.
+        If display is False, self is not modified and the path is returned instead.
+        
+        :param start: coordinates of the first cell of the path
+        :type start: tuple
+        :param goal: coordinates of the last cell of the path, the bottom right cell if None
+        :type goal: tuple
+        :param display: if True the path is displayed in self, if False it is returned
+        :type display: bool
+        :param algorithm: the name of the algorithm used, a key of solvers.SOLVERS
+        :type algorithm: str
+        :return: the maze with the solution displayed (or the path if display is False) or "No solution..."
+        :rtype: Maze, list or str
+        
+        :UC: start and goal are coordinates of cells of the maze
+        
+        Examples:
+        >>> maze = Maze(3, 2)
+        >>> maze.build_walls_down(1, 0)
+        >>> maze.build_walls_down(2, 0)
+        >>> maze.solve()
+        +-+-+-+
+        |x    |
+        + +-+-+
+        |x x x|
+        +-+-+-+
+        <BLANKLINE>
+        >>> maze.solve((2, 0), (2, 1))
+        +-+-+-+
+        |x x x|
+        + +-+-+
+        |x x x|
+        +-+-+-+
+        <BLANKLINE>
+        >>> maze.build_walls_down(0, 0)
+        >>> maze.solve()
+        'No solution...'
+        """
+        path = self.find_path(start, goal, algorithm)
+        if path is None:
+            return "No solution..."
+        if not display:
+            return path
+        cells = self.__cells
+        cells[:] = cells.translate(_DISPLAY_OFF)
+        width = self.__width
+        for (x, y) in path:
+            cells[y * width + x] |= DISPLAY
         return self
 
-    
\ No newline at end of file
+    
@@ -0,0 +1,296 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+:mod:`maze_archive` module : class MazeArchive used to store many mazes in one file.
+
+:author: `BART Sébastien / ELABDALLAH Mohammed / KROL Mikolaï`
+
+:date: 2018, november.
+
+An archive starts with a header of 8 bytes (the magic bytes MAGIC and the version
+of the format). The records follow : each one is the binary description of a maze
+(see binary_maze.py) compressed with zlib or lzma. The index is made of segments,
+with one entry per record giving its offset, its length, the width and the height of
+its maze, its seed and its compression. Each segment is followed by a footer giving
+the offset of the segment, its number of entries, the end of the previous footer (0
+for the first one) and the magic bytes INDEX_MAGIC. The archive ends with the last
+footer, and the whole index is read by following the footers back to the first one.
+
+Reading a maze only reads and decompresses its record. The new records are written
+after the last footer, and a segment with only their entries and its footer are
+written after them when the archive is flushed or closed : nothing already in the
+file is ever overwritten, and appending a maze adds only its record, its entry and at
+most one footer. If the process stops before, the end of the file is not a footer and
+the archive is opened with the last complete footer found before it, without the mazes
+appended since.
+
+
+"""
+
+import io
+import os
+import mmap
+import zlib
+import lzma
+import struct
+from binary_maze import maze_to_binary, binary_to_maze
+
+
+MAGIC = b'MAZA'
+INDEX_MAGIC = b'MAZI'
+VERSION = 2
+HEADER = struct.Struct('<4sHH')
+# offset, length, width, height, seed, has a seed, compression
+ENTRY = struct.Struct('<QQIIQBB')
+# offset of the segment of the index, number of its entries, end of the previous footer, magic bytes
+FOOTER = struct.Struct('<QQQ4s')
+
+COMPRESSIONS = {'zlib': (0, zlib.compress, zlib.decompress),
+                'lzma': (1, lzma.compress, lzma.decompress)}
+_DECOMPRESS = {code: decompress for code, compress, decompress in COMPRESSIONS.values()}
+
+
+class MazeArchive(object):
+    """
+    Creates an archive of mazes stored in a file.
+
+    >>> import os, tempfile
+    >>> from perfect_maze import perfect_maze
+    >>> folder = tempfile.TemporaryDirectory()
+    >>> path = os.path.join(folder.name, 'mazes.maz')
+    >>> with open_archive(path, 'a') as archive:
+    ...     for seed in range(3):
+    ...         archive.append(perfect_maze(12, 8, 'kruskal', seed), seed)
+    >>> with open_archive(path, 'a') as archive:
+    ...     archive.append(perfect_maze(5, 5, 'wilson', 9), 9, compression='lzma')
+    >>> archive = open_archive(path)
+    >>> len(archive), archive.info(3)
+    (4, (5, 5, 9))
+    >>> str(archive[1]) == str(perfect_maze(12, 8, 'kruskal', 1))
+    True
+    >>> [maze.get_width() for maze in archive]
+    [12, 12, 12, 5]
+    >>> archive.append(perfect_maze(5, 5))
+    Traceback (most recent call last):
+    ...
+    io.UnsupportedOperation: the archive is read only
+    >>> archive.close()
+
+    A record written without its index, as when the process stops before closing
+    the archive, is ignored:
+
+    >>> with open(path, 'ab') as stream:
+    ...     stream.write(b'an unfinished record') > 0
+    True
+    >>> with open_archive(path, 'a') as archive:
+    ...     len(archive), archive.info(-1)
+    ...     archive.append(perfect_maze(3, 3, 'kruskal', 2), 2)
+    (4, (5, 5, 9))
+    >>> with open_archive(path) as archive:
+    ...     [maze.get_width() for maze in archive]
+    [12, 12, 12, 5, 3]
+    >>> open(os.path.join(folder.name, 'empty.maz'), 'wb').close()
+    >>> open_archive(os.path.join(folder.name, 'empty.maz'))
+    Traceback (most recent call last):
+    ...
+    ValueError: not an archive of mazes
+    >>> folder.cleanup()
+    """
+
+    def __init__(self, path, mode='r'):
+        """
+        Opens the archive of the file path. In the mode 'r' the archive is read only, in the
+        mode 'a' the mazes can be appended and the file is created if it doesn't exist.
+
+        :param path: the name of the file
+        :type path: str
+        :param mode: 'r' or 'a'
+        :type mode: str
+        :return: the archive
+        :rtype: MazeArchive
+        :raise ValueError: if the file is not an archive of mazes
+        :UC: mode is 'r' or 'a'
+        """
+        if mode == 'a' and not os.path.exists(path):
+            self.__file = open(path, 'w+b')
+            self.__file.write(HEADER.pack(MAGIC, VERSION, 0))
+            self.__file.write(FOOTER.pack(HEADER.size, 0, 0, INDEX_MAGIC))
+            self.__file.flush()
+            self.__entries = []
+            self.__footer = HEADER.size + FOOTER.size
+        else:
+            self.__file = open(path, 'r+b' if mode == 'a' else 'rb')
+            self.__read_index()
+        # the end of the last footer, where the next record is written
+        self.__end = self.__footer
+        # the number of entries already written in the index
+        self.__indexed = len(self.__entries)
+        self.__writable = mode == 'a'
+
+    def __read_index(self):
+        stream = self.__file
+        header = stream.read(HEADER.size)
+        if len(header) < HEADER.size:
+            stream.close()
+            raise ValueError('not an archive of mazes')
+        magic, version, reserved = HEADER.unpack(header)
+        if magic != MAGIC:
+            stream.close()
+            raise ValueError('not an archive of mazes')
+        if version != VERSION:
+            stream.close()
+            raise ValueError('unknown version {:d} of the archive format'.format(version))
+        with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            end = self.__last_footer(mapped)
+            if end is None:
+                stream.close()
+                raise ValueError('the index of the archive is missing')
+            self.__footer = end
+            segments = []
+            while end:
+                if not self.__is_footer(mapped, end):
+                    stream.close()
+                    raise ValueError('the index of the archive is damaged')
+                offset, count, end, magic = FOOTER.unpack_from(mapped, end - FOOTER.size)
+                segments.append((offset, count))
+            self.__entries = [ENTRY.unpack_from(mapped, offset + i * ENTRY.size)
+                              for offset, count in reversed(segments) for i in range(count)]
+
+    @staticmethod
+    def __is_footer(mapped, end):
+        # True if a footer ends at end, right after its segment and after the previous footer
+        if not HEADER.size + FOOTER.size <= end <= len(mapped):
+            return False
+        offset, count, previous, magic = FOOTER.unpack_from(mapped, end - FOOTER.size)
+        return (magic == INDEX_MAGIC and HEADER.size <= offset and previous <= offset
+                and offset + count * ENTRY.size == end - FOOTER.size)
+
+    @staticmethod
+    def __last_footer(mapped):
+        # the end of the last footer, the end of the file if it was closed
+        position = len(mapped)
+        while True:
+            position = mapped.rfind(INDEX_MAGIC, HEADER.size, position)
+            if position < 0:
+                return None
+            end = position + len(INDEX_MAGIC)
+            if MazeArchive.__is_footer(mapped, end):
+                return end
+            position = end - 1
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __getitem__(self, i):
+        """
+        Returns the maze number i, reading and decompressing only its record.
+
+        :param i: the number of a maze, negative numbers count from the end
+        :type i: int
+        :return: the maze
+        :rtype: Maze
+        :raise IndexError: if there is no maze number i
+        """
+        offset, length, width, height, seed, has_seed, compression = self.__entries[i]
+        self.__file.seek(offset)
+        return binary_to_maze(_DECOMPRESS[compression](self.__file.read(length)))
+
+    def __iter__(self):
+        """
+        Yields the mazes of the archive in their order, reading the records one after the
+        other from the start to the end of the file.
+
+        :return: the mazes
+        :rtype: generator
+        """
+        stream = self.__file
+        stream.seek(HEADER.size)
+        for offset, length, width, height, seed, has_seed, compression in self.__entries:
+            if stream.tell() != offset:
+                stream.seek(offset)
+            yield binary_to_maze(_DECOMPRESS[compression](stream.read(length)))
+
+    def info(self, i):
+        """
+        Returns the width, the height and the seed of the maze number i, without reading it.
+
+        :param i: the number of a maze, negative numbers count from the end
+        :type i: int
+        :return: the width, the height and the seed (None if it is unknown)
+        :rtype: tuple
+        :raise IndexError: if there is no maze number i
+        """
+        offset, length, width, height, seed, has_seed, compression = self.__entries[i]
+        return width, height, seed if has_seed else None
+
+    def append(self, maze, seed=None, compression='zlib'):
+        """
+        Appends maze at the end of the archive.
+
+        :param maze: a maze
+        :type maze: Maze
+        :param seed: the seed of the maze, kept in the index
+        :type seed: int or NoneType
+        :param compression: the name of the compression, a key of COMPRESSIONS
+        :type compression: str
+        :return: None
+        :raise io.UnsupportedOperation: if the archive is opened in the mode 'r'
+        :UC: seed is None or 0 <= seed < 2**64
+        """
+        if not self.__writable:
+            raise io.UnsupportedOperation('the archive is read only')
+        code, compress, decompress = COMPRESSIONS[compression]
+        data = compress(maze_to_binary(maze))
+        self.__file.seek(self.__end)
+        self.__file.write(data)
+        self.__entries.append((self.__end, len(data), maze.get_width(), maze.get_height(),
+                               seed or 0, seed is not None, code))
+        self.__end += len(data)
+
+    def flush(self):
+        """
+        Writes after the last record a segment of the index with the entries of the mazes
+        appended since the last flush, and its footer. The previous footer is left in place
+        and stays valid until the new one is written.
+
+        :return: None
+        """
+        if self.__indexed < len(self.__entries):
+            stream = self.__file
+            stream.seek(self.__end)
+            stream.write(b''.join(ENTRY.pack(*entry) for entry in self.__entries[self.__indexed:]))
+            stream.write(FOOTER.pack(self.__end, len(self.__entries) - self.__indexed, self.__footer, INDEX_MAGIC))
+            stream.truncate()
+            stream.flush()
+            self.__end = self.__footer = stream.tell()
+            self.__indexed = len(self.__entries)
+
+    def close(self):
+        """
+        Writes the index if needed and closes the file of the archive.
+
+        :return: None
+        """
+        self.flush()
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+def open_archive(path, mode='r'):
+    """
+    Returns the archive of mazes of the file path, see MazeArchive.
+
+    :param path: the name of the file
+    :type path: str
+    :param mode: 'r' to read the archive, 'a' to append mazes to it
+    :type mode: str
+    :return: the archive
+    :rtype: MazeArchive
+    """
+    return MazeArchive(path, mode)
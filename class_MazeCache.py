@@ -0,0 +1,183 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+:mod:`maze_cache` module : class MazeCache used to keep the generated perfect mazes in a folder.
+
+:author: `BART Sébastien / ELABDALLAH Mohammed / KROL Mikolaï`
+
+:date: 2018, november.
+
+A perfect maze is entirely determined by its algorithm, its width, its height and
+its seed. Its file in the cache is named after a hash of these four values, so
+asking twice for the same maze only reads the file the second time. When the files
+take more than the allowed size, the least recently used ones are deleted.
+
+
+"""
+
+import os
+import hashlib
+from perfect_maze import *
+
+
+class MazeCache(object):
+    """
+    Creates a cache of perfect mazes in a folder.
+
+    >>> import tempfile
+    >>> folder = tempfile.TemporaryDirectory()
+    >>> cache = MazeCache(folder.name)
+    >>> maze = cache.perfect_maze(6, 4, 'kruskal', 7)
+    >>> str(cache.perfect_maze(6, 4, 'kruskal', 7)) == str(maze) == str(perfect_maze(6, 4, 'kruskal', 7))
+    True
+    >>> cache.stats()['hits'], cache.stats()['misses']
+    (1, 1)
+    >>> folder.cleanup()
+    """
+
+    def __init__(self, folder, max_size=2**30):
+        """
+        Creates a cache of mazes stored in folder which files take at most max_size bytes.
+        The mazes already in the folder are kept.
+
+        :param folder: the folder of the files of the cache, created if needed
+        :type folder: str
+        :param max_size: the maximum size of the files of the cache, in bytes
+        :type max_size: int
+        :return: a cache
+        :rtype: MazeCache
+        :UC: max_size >= 0
+        """
+        os.makedirs(folder, exist_ok=True)
+        self.__folder = folder
+        self.__max_size = max_size
+        self.__size = sum(entry.stat().st_size for entry in self.__entries())
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def __entries(self):
+        return [entry for entry in os.scandir(self.__folder) if entry.name.endswith('.maze')]
+
+    def path(self, algorithm, width, height, seed):
+        """
+        Returns the path of the file of the maze built by algorithm of size width*height with seed.
+
+        :param algorithm: the name of the algorithm, a key of GENERATORS
+        :type algorithm: str
+        :param width: the width of the maze
+        :type width: int
+        :param height: the height of the maze
+        :type height: int
+        :param seed: the seed of the maze
+        :type seed: int or str
+        :return: the path of the file
+        :rtype: str
+        :raise TypeError: if seed is not an int or a str
+
+        Examples:
+        >>> import tempfile
+        >>> folder = tempfile.TemporaryDirectory()
+        >>> cache = MazeCache(folder.name)
+        >>> cache.path('kruskal', 6, 4, 7) == cache.path('kruskal', 6, 4, 7) != cache.path('kruskal', 6, 4, 8)
+        True
+        >>> cache.path('kruskal', 6, 4, None)
+        Traceback (most recent call last):
+        ...
+        TypeError: the seed of a cached maze must be an int or a str, not NoneType
+        >>> folder.cleanup()
+        """
+        if not isinstance(seed, (int, str)):
+            # None or a random generator don't give the same maze each time
+            raise TypeError('the seed of a cached maze must be an int or a str, not ' + type(seed).__name__)
+        key = repr((algorithm, width, height, seed)).encode('utf-8')
+        return os.path.join(self.__folder, hashlib.sha256(key).hexdigest() + '.maze')
+
+    def perfect_maze(self, width, height, algorithm='backtracker', seed=0):
+        """
+        Returns the perfect maze of size width*height built by algorithm with seed, reading
+        it from its file if it is in the cache, building and saving it if not.
+
+        :param width: the width of the wanted maze
+        :type width: int
+        :param height: the height of the wanted maze
+        :type height: int
+        :param algorithm: the name of the algorithm used to build the maze, a key of GENERATORS
+        :type algorithm: str
+        :param seed: the seed of the maze
+        :type seed: int or str
+        :return: the perfect maze
+        :rtype: Maze
+        :raise TypeError: if seed is not an int or a str, such as None or a random generator
+
+        :UC: width and height > 0
+        """
+        path = self.path(algorithm, width, height, seed)
+        try:
+            with open(path, 'rb') as in_stream:
+                data = in_stream.read()
+        except FileNotFoundError:
+            pass
+        else:
+            os.utime(path)
+            self.__hits += 1
+            return maze_from_bytes(data)
+        self.__misses += 1
+        maze = perfect_maze(width, height, algorithm, seed)
+        self.__write(path, maze.to_bytes())
+        return maze
+
+    def __write(self, path, data):
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as out_stream:
+            out_stream.write(data)
+        os.replace(temporary, path)
+        self.__size += len(data)
+        if self.__size > self.__max_size:
+            self.__evict()
+
+    def __evict(self):
+        entries = sorted(self.__entries(), key=lambda entry: entry.stat().st_mtime)
+        self.__size = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if self.__size <= self.__max_size:
+                break
+            self.__size -= entry.stat().st_size
+            os.remove(entry.path)
+            self.__evictions += 1
+
+    def clear(self):
+        """
+        Deletes all the files of the cache.
+
+        :return: None
+        """
+        for entry in self.__entries():
+            os.remove(entry.path)
+        self.__size = 0
+
+    def stats(self):
+        """
+        Returns the counters of the cache : its number of hits, misses and evictions, its
+        number of files and their size in bytes.
+
+        :return: the counters
+        :rtype: dict
+
+        Examples:
+        >>> import tempfile
+        >>> folder = tempfile.TemporaryDirectory()
+        >>> cache = MazeCache(folder.name, max_size=100)
+        >>> for seed in range(3):
+        ...     maze = cache.perfect_maze(6, 6, 'kruskal', seed)
+        >>> stats = cache.stats()
+        >>> stats['misses'], stats['evictions'], stats['files'], stats['size']
+        (3, 1, 2, 88)
+        >>> folder.cleanup()
+        """
+        return {'hits': self.__hits,
+                'misses': self.__misses,
+                'evictions': self.__evictions,
+                'files': len(self.__entries()),
+                'size': self.__size}
@@ -0,0 +1,203 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+:mod:`path_planner` module : class PathPlanner used to keep a shortest path up to date while the walls of a maze change.
+
+:author: `BART Sébastien / ELABDALLAH Mohammed / KROL Mikolaï`
+
+:date: 2018, november.
+
+The planner follows the Lifelong Planning A* algorithm (LPA*). Each cell has an
+estimate g of its distance from the start and a one step lookahead rhs, the
+minimum of g+1 over its open neighbors. The cells where they differ are kept in a
+heap ordered by min(g, rhs) plus the Manhattan distance to the goal. Building or
+deleting a wall only updates the rhs of its two cells, and the next search
+expands the cells whose distance has changed and which can be on a shortest path,
+instead of all the cells of the maze.
+
+
+"""
+
+from heapq import heappush, heappop
+from array import array
+from class_Cell import *
+
+
+class PathPlanner(object):
+    """
+    Creates a planner of the shortest path between two cells of a maze.
+
+    >>> from class_Maze import Maze
+    >>> from solvers import bfs_path
+    >>> maze = Maze(5, 4)
+    >>> planner = PathPlanner(maze)
+    >>> len(planner.path())
+    8
+    >>> for x in range(4):
+    ...     maze.build_walls_down(x, 1)
+    >>> planner.distance() == len(bfs_path(maze, (0, 0), (4, 3))) - 1 == 7
+    True
+    >>> maze.build_walls_down(4, 1)
+    >>> planner.path() is None
+    True
+    >>> maze.delete_walls_down(2, 1)
+    >>> planner.path() == bfs_path(maze, (0, 0), (4, 3))
+    True
+    >>> planner.close()
+    """
+
+    def __init__(self, maze, start=(0, 0), goal=None):
+        """
+        Creates a planner of a shortest path from start to goal in maze, subscribed to the
+        changes of the walls of maze. No search is done until a path is asked.
+
+        :param maze: a maze
+        :type maze: Maze
+        :param start: coordinates of the first cell of the path
+        :type start: tuple
+        :param goal: coordinates of the last cell of the path, the bottom right cell if None
+        :type goal: tuple
+        :return: a planner
+        :rtype: PathPlanner
+        :UC: the walls of maze are only changed by its build_walls_* and delete_walls_* methods
+        """
+        width = maze.get_width()
+        size = width * maze.get_height()
+        if goal is None:
+            goal = (width - 1, maze.get_height() - 1)
+        self.__maze = maze
+        self.__cells = maze.get_cells()
+        self.__neighbors = maze.get_neighbors()
+        self.__width = width
+        self.__infinity = size
+        self.__start = start[1] * width + start[0]
+        self.__goal = goal[1] * width + goal[0]
+        self.__goal_x, self.__goal_y = goal
+        self.__g = array('l', [size]) * size
+        self.__rhs = array('l', [size]) * size
+        self.__rhs[self.__start] = 0
+        self.__heap = [self.__key(self.__start)]
+        self.__expanded = 0
+        maze.add_listener(self.__wall_changed)
+
+    def __key(self, index):
+        g = self.__g[index]
+        rhs = self.__rhs[index]
+        best = g if g < rhs else rhs
+        width = self.__width
+        return (best + abs(index % width - self.__goal_x) + abs(index // width - self.__goal_y), best, index)
+
+    def __update(self, index):
+        if index != self.__start:
+            g = self.__g
+            neighbors = self.__neighbors
+            best = self.__infinity
+            for direction in OPEN_DIRECTIONS[self.__cells[index]]:
+                neighbor = neighbors[direction][index]
+                if neighbor >= 0 and g[neighbor] + 1 < best:
+                    best = g[neighbor] + 1
+            self.__rhs[index] = best
+        if self.__g[index] != self.__rhs[index]:
+            heappush(self.__heap, self.__key(index))
+
+    def __wall_changed(self, index1, index2):
+        self.__update(index1)
+        self.__update(index2)
+
+    def __search(self):
+        g = self.__g
+        rhs = self.__rhs
+        cells = self.__cells
+        neighbors = self.__neighbors
+        heap = self.__heap
+        goal = self.__goal
+        infinity = self.__infinity
+        expanded = 0
+        while heap:
+            top = heap[0]
+            index = top[2]
+            if g[index] == rhs[index] or top != self.__key(index):
+                heappop(heap)
+                continue
+            if top >= self.__key(goal) and rhs[goal] == g[goal]:
+                break
+            heappop(heap)
+            expanded += 1
+            if g[index] > rhs[index]:
+                g[index] = rhs[index]
+            else:
+                g[index] = infinity
+                self.__update(index)
+            for direction in OPEN_DIRECTIONS[cells[index]]:
+                neighbor = neighbors[direction][index]
+                if neighbor >= 0:
+                    self.__update(neighbor)
+        self.__expanded = expanded
+
+    def distance(self):
+        """
+        Returns the length of a shortest path from the start to the goal.
+
+        :return: the number of moves, or None if there is no path
+        :rtype: int or NoneType
+        """
+        self.__search()
+        distance = self.__g[self.__goal]
+        return None if distance >= self.__infinity else distance
+
+    def path(self):
+        """
+        Returns a shortest path from the start to the goal, repaired from the previous one.
+
+        :return: the coordinates of the cells of the path, or None if there is no path
+        :rtype: list or NoneType
+        """
+        if self.distance() is None:
+            return None
+        g = self.__g
+        cells = self.__cells
+        neighbors = self.__neighbors
+        width = self.__width
+        index = self.__goal
+        path = [(index % width, index // width)]
+        while index != self.__start:
+            for direction in OPEN_DIRECTIONS[cells[index]]:
+                neighbor = neighbors[direction][index]
+                if neighbor >= 0 and g[neighbor] == g[index] - 1:
+                    break
+            index = neighbor
+            path.append((index % width, index // width))
+        path.reverse()
+        return path
+
+    def last_expanded(self):
+        """
+        Returns the number of cells expanded by the last search, which is small when only
+        a few walls have changed since the previous one.
+
+        :return: the number of expanded cells
+        :rtype: int
+
+        :Examples:
+        >>> from perfect_maze import perfect_maze
+        >>> maze = perfect_maze(30, 30, 'kruskal', 1)
+        >>> planner = PathPlanner(maze)
+        >>> first = planner.path()
+        >>> planner.last_expanded() > 30
+        True
+        >>> maze.delete_walls_down(29, 0)
+        >>> maze.build_walls_down(29, 0)
+        >>> planner.path() == first, planner.last_expanded()
+        (True, 0)
+        """
+        return self.__expanded
+
+    def close(self):
+        """
+        Unsubscribes the planner from the changes of the walls of its maze.
+
+        :return: None
+        """
+        self.__maze.remove_listener(self.__wall_changed)
+
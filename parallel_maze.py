@@ -0,0 +1,188 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Script used to build perfect mazes on several processes.
+Use the function tiled_perfect_maze to build one huge perfect maze.
+Use the function perfect_maze_batch to build many perfect mazes.
+
+:author: `BART Sébastien / ELABDALLAH Mohammed / KROL Mikolaï`
+
+:date: 2018, november.
+
+The grid of a huge maze is cut in tiles. Each tile is built as a perfect maze
+by a process of a ProcessPoolExecutor and only the bytes of its cells are sent
+back. The tiles are then joined by removing one wall on the border of each pair of
+neighbor tiles linked in a random spanning tree of the tiles : the maze stays perfect.
+
+Many mazes are built by the processes of a ProcessPoolExecutor too, each process
+sending back the compact description of its maze given by Maze.to_bytes.
+
+
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from perfect_maze import *
+
+
+def tile_cells(width, height, algorithm, seed):
+    """
+    Returns the flags of the cells of a perfect maze of size width*height.
+    Used by the processes of tiled_perfect_maze.
+
+    :param width: the width of the tile
+    :type width: int
+    :param height: the height of the tile
+    :type height: int
+    :param algorithm: the name of the algorithm used to build the tile, a key of GENERATORS
+    :type algorithm: str
+    :param seed: the seed of the tile
+    :type seed: int
+    :return: the flags of the cells of the tile
+    :rtype: bytes
+
+    :UC: width and height > 0
+
+    :Examples:
+    >>> len(tile_cells(3, 2, 'kruskal', 0))
+    6
+    """
+    return bytes(perfect_maze(width, height, algorithm, seed).get_cells())
+
+
+def tiled_perfect_maze(width, height, tile_width=256, tile_height=256, algorithm='kruskal', workers=None, validate=False, seed=None):
+    """
+    Returns a perfect maze of size width*height built tile by tile on several processes.
+
+    :param width: the width of the wanted maze
+    :type width: int
+    :param height: the height of the wanted maze
+    :type height: int
+    :param tile_width: the width of the tiles
+    :type tile_width: int
+    :param tile_height: the height of the tiles
+    :type tile_height: int
+    :param algorithm: the name of the algorithm used to build the tiles, a key of GENERATORS
+    :type algorithm: str
+    :param workers: the number of processes, the number of processors if None
+    :type workers: int
+    :param validate: if True, checks that the maze is a spanning tree of its cells
+    :type validate: bool
+    :param seed: the seed or the random generator used, see random_generator
+    :type seed: int, str, Random or NoneType
+    :return: the perfect maze
+    :rtype: Maze
+    :raise RuntimeError: if validate is True and the maze is not perfect
+
+    :UC: width, height, tile_width and tile_height > 0
+
+    :Examples:
+    >>> maze = tiled_perfect_maze(13, 7, 4, 3, workers=2, validate=True)
+    >>> is_perfect(maze)
+    True
+    >>> is_perfect(tiled_perfect_maze(1, 1, workers=1))
+    True
+    >>> str(tiled_perfect_maze(9, 9, 4, 4, seed=5)) == str(tiled_perfect_maze(9, 9, 4, 4, seed=5))
+    True
+    """
+    rng = random_generator(seed)
+    maze = Maze(width, height)
+    cells = maze.get_cells()
+    tiles = [(x0, y0, min(tile_width, width - x0), min(tile_height, height - y0))
+             for y0 in range(0, height, tile_height) for x0 in range(0, width, tile_width)]
+    with ProcessPoolExecutor(workers) as executor:
+        results = executor.map(tile_cells, [tile[2] for tile in tiles], [tile[3] for tile in tiles],
+                               [algorithm] * len(tiles), [rng.getrandbits(64) for tile in tiles])
+        for (x0, y0, w, h), flags in zip(tiles, results):
+            for y in range(h):
+                start = (y0 + y) * width + x0
+                cells[start:start + w] = flags[y * w:(y + 1) * w]
+    columns = (width + tile_width - 1) // tile_width
+    borders = [2 * tile for tile in range(len(tiles)) if tile % columns != columns - 1]
+    borders += [2 * tile + 1 for tile in range(len(tiles) - columns)]
+    rng.shuffle(borders)
+    sets = UnionFind(len(tiles))
+    for border in borders:
+        tile = border >> 1
+        x0, y0, w, h = tiles[tile]
+        if border & 1:
+            if sets.union(tile, tile + columns):
+                index = (y0 + h - 1) * width + x0 + rng.randrange(w)
+                carve(cells, width, index, index + width)
+        elif sets.union(tile, tile + 1):
+            index = (y0 + rng.randrange(h)) * width + x0 + w - 1
+            carve(cells, width, index, index + 1)
+    if validate and not is_perfect(maze):
+        raise RuntimeError('the tiled maze is not a spanning tree of its cells')
+    return maze
+
+
+def maze_bytes(width, height, algorithm, seed):
+    """
+    Returns the compact description of a perfect maze of size width*height.
+    Used by the processes of perfect_maze_batch.
+
+    :param width: the width of the maze
+    :type width: int
+    :param height: the height of the maze
+    :type height: int
+    :param algorithm: the name of the algorithm used to build the maze, a key of GENERATORS
+    :type algorithm: str
+    :param seed: the seed of the maze
+    :type seed: int or str
+    :return: the description of the maze, see Maze.to_bytes
+    :rtype: bytes
+
+    :Examples:
+    >>> is_perfect(maze_from_bytes(maze_bytes(3, 2, 'kruskal', 1)))
+    True
+    """
+    return perfect_maze(width, height, algorithm, seed).to_bytes()
+
+
+def perfect_maze_batch(count, width, height, seeds=None, workers=None, algorithm='backtracker'):
+    """
+    Yields count perfect mazes of size width*height built on several processes, in the
+    order in which they are finished. Each maze comes with its seed.
+
+    :param count: the number of mazes
+    :type count: int
+    :param width: the width of the wanted mazes
+    :type width: int
+    :param height: the height of the wanted mazes
+    :type height: int
+    :param seeds: the seeds of the mazes, random seeds if None
+    :type seeds: iterable
+    :param workers: the number of processes, the number of processors (or 1 if it is unknown) if None
+    :type workers: int
+    :param algorithm: the name of the algorithm used to build the mazes, a key of GENERATORS
+    :type algorithm: str
+    :return: the (seed, maze) pairs
+    :rtype: generator
+
+    :UC: width and height > 0, seeds gives at least count seeds
+
+    :Examples:
+    >>> mazes = dict(perfect_maze_batch(3, 5, 4, seeds=[1, 2, 3], workers=2, algorithm='kruskal'))
+    >>> sorted(mazes)
+    [1, 2, 3]
+    >>> str(mazes[2]) == str(perfect_maze(5, 4, 'kruskal', 2))
+    True
+    """
+    if seeds is None:
+        rng = random_generator()
+        seeds = (rng.getrandbits(64) for i in range(count))
+    seeds = iter(seeds)
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as executor:
+        running = {}
+        submitted = 0
+        while submitted < count or running:
+            while submitted < count and len(running) < 2 * workers:
+                seed = next(seeds)
+                running[executor.submit(maze_bytes, width, height, algorithm, seed)] = seed
+                submitted += 1
+            done, pending = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield running.pop(future), maze_from_bytes(future.result())
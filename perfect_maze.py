@@ -3,7 +3,7 @@
 
 """
 Script used to build a perfect maze.
-Use the function perfect_maze.
+Use the function perfect_maze, the algorithm used is chosen among GENERATORS.
 
 :author: `BART Sébastien / ELABDALLAH Mohammed / KROL Mikolaï`
 
@@ -12,8 +12,11 @@ Use the function perfect_maze.
 
 """
 
+from array import array
 from stack import *
+from union_find import *
 from class_Maze import *
+from row_maze import binary_tree_maze, sidewinder_maze, eller_maze
 
 
 def full_maze(width, height):
@@ -45,12 +48,8 @@ def full_maze(width, height):
     <BLANKLINE>
     """
     maze = Maze(width, height)
-    for ligne in maze.get_grid():
-        for case in ligne:
-            case.set_wall_right()
-            case.set_wall_down()
-            case.set_wall_up()
-            case.set_wall_left()
+    cells = maze.get_cells()
+    cells[:] = bytes([ALL_WALLS]) * len(cells)
     return maze
     
     
@@ -91,31 +90,302 @@ def remove_walls(maze, tuple1, tuple2):
         maze.delete_walls_down(x1, y1)
             
             
-def perfect_maze(width, height):
+def backtracker_maze(width, height, seed=None):
     """
-    Returns a perfect maze of size width*height.
+    Returns a perfect maze of size width*height built with a randomized depth-first search.
     
     :param width: the width of the wanted maze
     :type width: int
     :param height: the heught of the wanted maze
     :type height: int
+    :param seed: the seed or the random generator used, see random_generator
+    :type seed: int, str, Random or NoneType
     :return: the perfect maze
     :rtype: Maze
     
-    :UC: width and height > 1
+    :UC: width and height > 0
     """
-    x, y = randint(0, width-1), randint(0, height-1)
+    rng = random_generator(seed)
     stack = Stack()
     maze = full_maze(width, height)
-    while not maze.all_visited():
-        maze.get_cell(x, y).set_visited()
-        next_coor = maze.choose_unvisited_random_neighbor(x, y)
-        if next_coor == ():
-            (x, y) = stack.pop()
+    cells = maze.get_cells()
+    north, east, south, west = maze.get_neighbors()
+    visited = bytearray(width * height)
+    index = rng.randrange(width * height)
+    visited[index] = 1
+    unvisited = width * height - 1
+    while unvisited > 0:
+        possibilities = [neighbor for neighbor in (north[index], east[index], south[index], west[index])
+                         if neighbor >= 0 and not visited[neighbor]]
+        if possibilities == []:
+            index = stack.pop()
         else:
-            stack.push((x, y))
-            (next_x, next_y) = next_coor
-            remove_walls(maze, (x,y), (next_x, next_y))
-            (x, y) = (next_x, next_y)
-    maze.reset_all_visited()
-    return maze
\ No newline at end of file
+            stack.push(index)
+            neighbor = rng.choice(possibilities)
+            carve(cells, width, index, neighbor)
+            index = neighbor
+            visited[index] = 1
+            unvisited -= 1
+    return maze
+
+
+def carve(cells, width, index1, index2):
+    """
+    Removes the wall between the neighbor cells at positions index1 and index2 of cells.
+    
+    :param cells: the flags of the cells of a maze
+    :type cells: bytearray
+    :param width: the width of the maze
+    :type width: int
+    :param index1: position of a cell
+    :type index1: int
+    :param index2: position of a neighbor of the cell
+    :type index2: int
+    
+    :Examples:
+    >>> maze = full_maze(2, 2)
+    >>> carve(maze.get_cells(), 2, 3, 1)
+    >>> maze
+    +-+-+
+    | | |
+    +-+ +
+    | | |
+    +-+-+
+    <BLANKLINE>
+    """
+    if index2 == index1 + width:
+        cells[index1] &= ~WALL_DOWN
+        cells[index2] &= ~WALL_UP
+    elif index2 == index1 - width:
+        cells[index1] &= ~WALL_UP
+        cells[index2] &= ~WALL_DOWN
+    elif index2 == index1 + 1:
+        cells[index1] &= ~WALL_RIGHT
+        cells[index2] &= ~WALL_LEFT
+    else:
+        cells[index1] &= ~WALL_LEFT
+        cells[index2] &= ~WALL_RIGHT
+
+
+def random_neighbor(index, neighbors, rng):
+    """
+    Returns the position of a random neighbor of the cell at position index.
+    
+    :param index: position of a cell
+    :type index: int
+    :param neighbors: the table of the neighbors of the cells, see neighbor_table
+    :type neighbors: tuple
+    :param rng: the random generator used
+    :type rng: Random
+    :return: the position of the neighbor
+    :rtype: int
+    
+    :UC: width*height > 1
+    
+    :Examples:
+    >>> random_neighbor(0, neighbor_table(2, 1), Random())
+    1
+    """
+    while True:
+        neighbor = neighbors[rng.getrandbits(2)][index]
+        if neighbor >= 0:
+            return neighbor
+
+
+def kruskal_maze(width, height, seed=None):
+    """
+    Returns a perfect maze of size width*height built with the randomized Kruskal's algorithm :
+    the walls are removed in a random order when they separate two cells which are not connected yet.
+    
+    :param width: the width of the wanted maze
+    :type width: int
+    :param height: the height of the wanted maze
+    :type height: int
+    :param seed: the seed or the random generator used, see random_generator
+    :type seed: int, str, Random or NoneType
+    :return: the perfect maze
+    :rtype: Maze
+    
+    :UC: width and height > 0
+    
+    :Examples:
+    >>> is_perfect(kruskal_maze(6, 4))
+    True
+    """
+    rng = random_generator(seed)
+    maze = full_maze(width, height)
+    cells = maze.get_cells()
+    size = width * height
+    walls = [2 * index for index in range(size) if index % width != width - 1]
+    walls += [2 * index + 1 for index in range(size - width)]
+    rng.shuffle(walls)
+    sets = UnionFind(size)
+    remaining = size - 1
+    for wall in walls:
+        if remaining == 0:
+            break
+        index1 = wall >> 1
+        index2 = index1 + width if wall & 1 else index1 + 1
+        if sets.union(index1, index2):
+            carve(cells, width, index1, index2)
+            remaining -= 1
+    return maze
+
+
+def wilson_maze(width, height, seed=None):
+    """
+    Returns a perfect maze of size width*height built with Wilson's algorithm : loop-erased
+    random walks are added to the maze until it covers all the cells. All the perfect mazes
+    are equally likely.
+    
+    :param width: the width of the wanted maze
+    :type width: int
+    :param height: the height of the wanted maze
+    :type height: int
+    :param seed: the seed or the random generator used, see random_generator
+    :type seed: int, str, Random or NoneType
+    :return: the perfect maze
+    :rtype: Maze
+    
+    :UC: width and height > 0
+    
+    :Examples:
+    >>> is_perfect(wilson_maze(6, 4))
+    True
+    """
+    rng = random_generator(seed)
+    maze = full_maze(width, height)
+    cells = maze.get_cells()
+    size = width * height
+    neighbors = maze.get_neighbors()
+    in_maze = bytearray(size)
+    in_maze[rng.randrange(size)] = 1
+    exits = array('l', bytes(8 * size))
+    for start in range(size):
+        index = start
+        while not in_maze[index]:
+            exits[index] = random_neighbor(index, neighbors, rng)
+            index = exits[index]
+        index = start
+        while not in_maze[index]:
+            in_maze[index] = 1
+            carve(cells, width, index, exits[index])
+            index = exits[index]
+    return maze
+
+
+def aldous_broder_maze(width, height, seed=None):
+    """
+    Returns a perfect maze of size width*height built with the Aldous-Broder algorithm : a random
+    walk removes the wall in front of it each time it enters a cell for the first time.
+    All the perfect mazes are equally likely.
+    
+    :param width: the width of the wanted maze
+    :type width: int
+    :param height: the height of the wanted maze
+    :type height: int
+    :param seed: the seed or the random generator used, see random_generator
+    :type seed: int, str, Random or NoneType
+    :return: the perfect maze
+    :rtype: Maze
+    
+    :UC: width and height > 0
+    
+    :Examples:
+    >>> is_perfect(aldous_broder_maze(6, 4))
+    True
+    """
+    rng = random_generator(seed)
+    maze = full_maze(width, height)
+    cells = maze.get_cells()
+    size = width * height
+    neighbors = maze.get_neighbors()
+    visited = bytearray(size)
+    index = rng.randrange(size)
+    visited[index] = 1
+    remaining = size - 1
+    while remaining > 0:
+        neighbor = random_neighbor(index, neighbors, rng)
+        if not visited[neighbor]:
+            visited[neighbor] = 1
+            carve(cells, width, index, neighbor)
+            remaining -= 1
+        index = neighbor
+    return maze
+
+
+GENERATORS = {'backtracker': backtracker_maze,
+              'kruskal': kruskal_maze,
+              'wilson': wilson_maze,
+              'aldous_broder': aldous_broder_maze,
+              'binary_tree': binary_tree_maze,
+              'sidewinder': sidewinder_maze,
+              'eller': eller_maze}
+
+
+def perfect_maze(width, height, algorithm='backtracker', seed=None):
+    """
+    Returns a perfect maze of size width*height.
+    
+    :param width: the width of the wanted maze
+    :type width: int
+    :param height: the heught of the wanted maze
+    :type height: int
+    :param algorithm: the name of the algorithm used to build the maze, a key of GENERATORS
+    :type algorithm: str
+    :param seed: the seed or the random generator used, see random_generator
+    :type seed: int, str, Random or NoneType
+    :return: the perfect maze
+    :rtype: Maze
+    
+    :UC: width and height > 0
+    
+    :Examples:
+    >>> all(is_perfect(perfect_maze(5, 3, algorithm)) for algorithm in GENERATORS)
+    True
+    >>> all(str(perfect_maze(9, 7, algorithm, 3)) == str(perfect_maze(9, 7, algorithm, 3)) for algorithm in GENERATORS)
+    True
+    >>> perfect_maze(5, 3, 'prim')
+    Traceback (most recent call last):
+    ...
+    KeyError: 'prim'
+    """
+    return GENERATORS[algorithm](width, height, seed)
+
+
+def is_perfect(maze):
+    """
+    Returns True if maze is perfect, that is if there is one and only one path
+    between any two of its cells, False if not.
+    
+    :param maze: a maze
+    :type maze: Maze
+    :return: True if maze is perfect, False if not
+    :rtype: bool
+    
+    :Examples:
+    >>> is_perfect(perfect_maze(6, 4))
+    True
+    >>> is_perfect(full_maze(2, 2))
+    False
+    >>> is_perfect(Maze(2, 2))
+    False
+    """
+    cells = maze.get_cells()
+    neighbors = maze.get_neighbors()
+    passages = 0
+    for flags in cells:
+        passages += (not flags & WALL_RIGHT) + (not flags & WALL_DOWN)
+    if passages != len(cells) - 1:
+        return False
+    reached = bytearray(len(cells))
+    reached[0] = 1
+    todo = [0]
+    while todo:
+        index = todo.pop()
+        for direction in OPEN_DIRECTIONS[cells[index]]:
+            neighbor = neighbors[direction][index]
+            if neighbor >= 0 and not reached[neighbor]:
+                reached[neighbor] = 1
+                todo.append(neighbor)
+    return all(reached)
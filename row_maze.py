@@ -0,0 +1,390 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Script used to build perfect mazes row by row.
+Use the functions binary_tree_maze, sidewinder_maze or eller_maze.
+Use the function write_eller_maze to write a perfect maze too big to be held in memory.
+
+:author: `BART Sébastien / ELABDALLAH Mohammed / KROL Mikolaï`
+
+:date: 2018, november.
+
+A row is described by two bytearrays east and south with one byte per cell:
+east[x] is 1 if the cell x is open to its right neighbor and south[x] is 1 if it
+is open to its bottom neighbor, 0 otherwise. The flags of a whole row are
+computed from them with big integer and bytes.translate operations, so no python
+loop runs over the cells of a row except in Eller's algorithm.
+
+
+"""
+
+import os
+import sys
+from class_Maze import *
+
+
+_TO_BIT = bytes(byte & 1 for byte in range(256))
+_NOT_BIT = bytes(1 - (byte & 1) for byte in range(256))
+
+# flags of a cell from (east open) | (west open) << 1 | (south open) << 2 | (north open) << 3
+_CODE_TO_FLAGS = bytes((0 if code & 1 else WALL_RIGHT) | (0 if code & 2 else WALL_LEFT) |
+                       (0 if code & 4 else WALL_DOWN) | (0 if code & 8 else WALL_UP)
+                       for code in range(256))
+
+_RIGHT_CHARS = bytes(ord(' ') if byte else ord('|') for byte in range(256))
+_DOWN_CHARS = bytes(ord(' ') if byte else ord('-') for byte in range(256))
+
+
+def row_flags(east, south, north):
+    """
+    Returns the flags of the cells of a row.
+
+    :param east: 1 for the cells open to their right neighbor, 0 for the others
+    :type east: bytearray
+    :param south: 1 for the cells open to their bottom neighbor, 0 for the others
+    :type south: bytearray
+    :param north: 1 for the cells open to their top neighbor, 0 for the others
+    :type north: bytearray
+    :return: the flags of the cells of the row
+    :rtype: bytes
+
+    :UC: east, south and north have the same length and the last byte of east is 0
+
+    :Examples:
+    >>> list(row_flags(bytearray([1, 0]), bytearray([0, 1]), bytearray(2))) == [WALL_UP | WALL_LEFT | WALL_DOWN, WALL_UP | WALL_RIGHT]
+    True
+    """
+    width = len(east)
+    west = b'\x00' + bytes(east[:-1])
+    code = (int.from_bytes(east, 'little') | int.from_bytes(west, 'little') << 1 |
+            int.from_bytes(south, 'little') << 2 | int.from_bytes(north, 'little') << 3)
+    return code.to_bytes(width, 'little').translate(_CODE_TO_FLAGS)
+
+
+def rows_to_maze(width, height, rows):
+    """
+    Returns the maze described by rows.
+
+    :param width: width of the maze
+    :type width: int
+    :param height: height of the maze
+    :type height: int
+    :param rows: the (east, south) description of each row, from top to bottom
+    :type rows: iterable
+    :return: the maze
+    :rtype: Maze
+
+    :UC: rows describes height rows of width cells
+
+    :Examples:
+    >>> rows_to_maze(3, 2, [(bytearray([1, 0, 0]), bytearray([0, 1, 1])), (bytearray([1, 1, 0]), bytearray(3))])
+    +-+-+-+
+    |   | |
+    +-+ + +
+    |     |
+    +-+-+-+
+    <BLANKLINE>
+    """
+    maze = Maze(width, height)
+    cells = maze.get_cells()
+    north = bytearray(width)
+    for y, (east, south) in enumerate(rows):
+        cells[y * width:(y + 1) * width] = row_flags(east, south, north)
+        north = south
+    return maze
+
+
+def random_bits(width, rng):
+    """
+    Returns width random bytes worth 0 or 1.
+
+    :param width: the number of bytes
+    :type width: int
+    :param rng: the random generator used
+    :type rng: Random
+    :return: random bits
+    :rtype: bytearray
+
+    :Examples:
+    >>> bits = random_bits(10, Random())
+    >>> len(bits), set(bits) <= {0, 1}
+    (10, True)
+    """
+    return bytearray(rng.randbytes(width).translate(_TO_BIT))
+
+
+def binary_tree_rows(width, height, rng):
+    """
+    Yields the rows of a perfect maze built with the binary tree algorithm : each cell
+    is open either to its right or to its bottom neighbor.
+
+    :param width: width of the maze
+    :type width: int
+    :param height: height of the maze
+    :type height: int
+    :param rng: the random generator used
+    :type rng: Random
+    :return: the (east, south) description of each row
+    :rtype: generator
+
+    :UC: width and height > 0
+    """
+    for y in range(height - 1):
+        east = random_bits(width, rng)
+        east[-1] = 0
+        yield east, east.translate(_NOT_BIT)
+    east = bytearray(b'\x01') * width
+    east[-1] = 0
+    yield east, bytearray(width)
+
+
+def sidewinder_rows(width, height, rng):
+    """
+    Yields the rows of a perfect maze built with the sidewinder algorithm : each row
+    is cut in random runs of cells open to the right, and each run is open to the bottom
+    from one of its cells. The last row is a single run.
+
+    :param width: width of the maze
+    :type width: int
+    :param height: height of the maze
+    :type height: int
+    :param rng: the random generator used
+    :type rng: Random
+    :return: the (east, south) description of each row
+    :rtype: generator
+
+    :UC: width and height > 0
+    """
+    for y in range(height - 1):
+        east = random_bits(width, rng)
+        east[-1] = 0
+        south = bytearray(width)
+        start = 0
+        while start < width:
+            end = east.find(0, start)
+            south[start + rng.randrange(end - start + 1)] = 1
+            start = end + 1
+        yield east, south
+    east = bytearray(b'\x01') * width
+    east[-1] = 0
+    yield east, bytearray(width)
+
+
+def eller_rows(width, height, rng):
+    """
+    Yields the rows of a perfect maze built with Eller's algorithm. Only the sets of
+    the cells of the current row are kept, so the memory used is proportional to width.
+
+    :param width: width of the maze
+    :type width: int
+    :param height: height of the maze
+    :type height: int
+    :param rng: the random generator used
+    :type rng: Random
+    :return: the (east, south) description of each row
+    :rtype: generator
+
+    :UC: width and height > 0
+    """
+    sets = list(range(width))
+    next_set = width
+    for y in range(height):
+        last = y == height - 1
+        members = {}
+        for x in range(width):
+            members.setdefault(sets[x], []).append(x)
+        east = bytearray(width)
+        merge = random_bits(width, rng)
+        for x in range(width - 1):
+            kept, merged = sets[x], sets[x + 1]
+            if kept != merged and (last or merge[x]):
+                east[x] = 1
+                if len(members[kept]) < len(members[merged]):
+                    kept, merged = merged, kept
+                for column in members[merged]:
+                    sets[column] = kept
+                members[kept] += members.pop(merged)
+        south = bytearray(width)
+        if not last:
+            down = random_bits(width, rng)
+            for columns in members.values():
+                opened = False
+                for column in columns:
+                    if down[column]:
+                        south[column] = 1
+                        opened = True
+                if not opened:
+                    south[rng.choice(columns)] = 1
+            for x in range(width):
+                if not south[x]:
+                    sets[x] = next_set
+                    next_set += 1
+        yield east, south
+
+
+def binary_tree_maze(width, height, seed=None):
+    """
+    Returns a perfect maze of size width*height built with the binary tree algorithm.
+
+    :param width: the width of the wanted maze
+    :type width: int
+    :param height: the height of the wanted maze
+    :type height: int
+    :param seed: the seed or the random generator used, see random_generator
+    :type seed: int, str, Random or NoneType
+    :return: the perfect maze
+    :rtype: Maze
+
+    :UC: width and height > 0
+
+    :Examples:
+    >>> from perfect_maze import is_perfect
+    >>> is_perfect(binary_tree_maze(7, 5))
+    True
+    """
+    return rows_to_maze(width, height, binary_tree_rows(width, height, random_generator(seed)))
+
+
+def sidewinder_maze(width, height, seed=None):
+    """
+    Returns a perfect maze of size width*height built with the sidewinder algorithm.
+
+    :param width: the width of the wanted maze
+    :type width: int
+    :param height: the height of the wanted maze
+    :type height: int
+    :param seed: the seed or the random generator used, see random_generator
+    :type seed: int, str, Random or NoneType
+    :return: the perfect maze
+    :rtype: Maze
+
+    :UC: width and height > 0
+
+    :Examples:
+    >>> from perfect_maze import is_perfect
+    >>> is_perfect(sidewinder_maze(7, 5))
+    True
+    """
+    return rows_to_maze(width, height, sidewinder_rows(width, height, random_generator(seed)))
+
+
+def eller_maze(width, height, seed=None):
+    """
+    Returns a perfect maze of size width*height built with Eller's algorithm.
+
+    :param width: the width of the wanted maze
+    :type width: int
+    :param height: the height of the wanted maze
+    :type height: int
+    :param seed: the seed or the random generator used, see random_generator
+    :type seed: int, str, Random or NoneType
+    :return: the perfect maze
+    :rtype: Maze
+
+    :UC: width and height > 0
+
+    :Examples:
+    >>> from perfect_maze import is_perfect
+    >>> is_perfect(eller_maze(7, 5))
+    True
+    >>> is_perfect(eller_maze(1, 1))
+    True
+    >>> str(eller_maze(8, 8, 12)) == str(eller_maze(8, 8, 12))
+    True
+    """
+    return rows_to_maze(width, height, eller_rows(width, height, random_generator(seed)))
+
+
+def row_text(east, south):
+    """
+    Returns the two lines of the description of a row, in the format of Maze.to_txt.
+
+    :param east: 1 for the cells open to their right neighbor, 0 for the others
+    :type east: bytearray
+    :param south: 1 for the cells open to their bottom neighbor, 0 for the others
+    :type south: bytearray
+    :return: the line of the cells and the line of their bottom walls
+    :rtype: tuple
+
+    :Examples:
+    >>> cells, walls = row_text(bytearray([1, 0, 0]), bytearray([0, 1, 1]))
+    >>> print(cells + walls, end='')
+    |   | |
+    +-+ + +
+    """
+    width = len(east)
+    cells = bytearray(b'|') * (2 * width + 2)
+    cells[1:-1:2] = b' ' * width
+    cells[2:-1:2] = east.translate(_RIGHT_CHARS)
+    cells[-1] = ord('\n')
+    walls = bytearray(b'+') * (2 * width + 2)
+    walls[1:-1:2] = south.translate(_DOWN_CHARS)
+    walls[-1] = ord('\n')
+    return cells.decode('ascii'), walls.decode('ascii')
+
+
+def write_eller_maze(file, width, height, seed=None):
+    """
+    Writes in file the description of a perfect maze of size width*height built with
+    Eller's algorithm, in the format read by txt_to_maze.file_to_maze.
+    The maze is written row by row and never held in memory, so it can be larger than
+    the memory : only the state of one row is kept.
+
+    :param file: the path of the file or the text stream to be written in
+    :type file: str, os.PathLike or file
+    :param width: the width of the wanted maze
+    :type width: int
+    :param height: the height of the wanted maze
+    :type height: int
+    :param seed: the seed or the random generator used, see random_generator
+    :type seed: int, str, Random or NoneType
+    :return: None
+
+    :UC: width and height > 0
+
+    :Examples:
+    >>> import io
+    >>> stream = io.StringIO()
+    >>> write_eller_maze(stream, 4, 3)
+    >>> lines = stream.getvalue().splitlines()
+    >>> lines[:3]
+    ['4', '3', '+-+-+-+-+']
+    >>> len(lines), lines[-1]
+    (9, '+-+-+-+-+')
+    >>> all(line[0] == line[-1] == '|' for line in lines[3::2])
+    True
+    >>> import pathlib, tempfile
+    >>> folder = tempfile.TemporaryDirectory()
+    >>> path = pathlib.Path(folder.name, 'maze.txt')
+    >>> write_eller_maze(path, 4, 3, seed=5)
+    >>> path.read_text().splitlines()[2:] == str(eller_maze(4, 3, 5)).splitlines()
+    True
+    >>> folder.cleanup()
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'w', buffering=2**20) as out_stream:
+            write_eller_maze(out_stream, width, height, seed)
+        return
+    file.write(str(width) + '\n')
+    file.write(str(height) + '\n')
+    file.write('+-' * width + '+\n')
+    for east, south in eller_rows(width, height, random_generator(seed)):
+        cells, walls = row_text(east, south)
+        file.write(cells)
+        file.write(walls)
+
+
+def main():
+    try:
+        file = sys.argv[1]
+        width = int(sys.argv[2])
+        height = int(sys.argv[3])
+    except (IndexError, ValueError):
+        print('Utilisation: python3 row_maze.py <FILE> <WIDTH> <HEIGHT>')
+    else:
+        write_eller_maze(file, width, height)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,651 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Script used to find paths in a maze.
+Use the function find_path, or the method find_path of the class Maze.
+
+:author: `BART Sébastien / ELABDALLAH Mohammed / KROL Mikolaï`
+
+:date: 2018, november.
+
+The solvers work on the positions of the cells in the bytearray of the maze
+(see Maze.get_cells and Maze.get_neighbors) and keep their state in their own
+arrays : they never modify the maze, so several threads can search paths in the
+same maze at once. The arrays are taken from a pool of SearchBuffers and given
+back after the search, so a search doesn't allocate and clear arrays as large as
+the maze. The pool keeps at most POOL_BYTES bytes of buffers, see clear_pool.
+
+
+"""
+
+import threading
+from array import array
+from heapq import heappush, heappop
+from contextlib import contextmanager
+from class_Cell import *
+
+
+# the number of directions without a wall, for each byte of flags of a cell
+_OPEN_COUNTS = bytes(len(directions) for directions in OPEN_DIRECTIONS)
+
+# number of free SearchBuffers kept for each size, and number of sizes kept
+POOL_SIZE = 8
+
+# number of bytes of all the free SearchBuffers kept
+POOL_BYTES = 2**26
+
+_POOL = {}
+_POOL_LOCK = threading.Lock()
+
+
+class SearchBuffers(object):
+    """
+    Creates the arrays used by a search in a maze of size cells : the stamps, the
+    parents and the costs of the cells. The parent and the cost of a cell are only
+    meaningful if its stamp is one of the epochs of the current search, so the
+    arrays are never cleared between two searches.
+
+    >>> buffers = SearchBuffers(4)
+    >>> buffers.next_epoch(), buffers.next_epoch(2), buffers.next_epoch()
+    (1, 2, 4)
+    >>> len(buffers.get_stamps()), len(buffers.get_parents()), len(buffers.get_costs())
+    (4, 4, 4)
+    """
+
+    def __init__(self, size):
+        """
+        :param size: the number of cells
+        :type size: int
+        :return: the arrays of a search
+        :rtype: SearchBuffers
+        """
+        self.__stamps = array('I', [0]) * size
+        self.__parents = array('i', [0]) * size
+        self.__costs = array('i', [0]) * size
+        self.__epoch = 0
+        self.__last_epoch = 2 ** (8 * self.__stamps.itemsize) - 1
+
+    def next_epoch(self, count=1):
+        """
+        Reserves count new epochs for a search and returns the first one. The stamps are
+        cleared only when the epochs are exhausted.
+
+        :param count: the number of epochs needed by the search
+        :type count: int
+        :return: the first epoch
+        :rtype: int
+        """
+        if self.__epoch + count > self.__last_epoch:
+            self.__stamps[:] = array('I', [0]) * len(self.__stamps)
+            self.__epoch = 0
+        first = self.__epoch + 1
+        self.__epoch += count
+        return first
+
+    def get_stamps(self):
+        """
+        :return: the stamps of the cells
+        :rtype: array
+        """
+        return self.__stamps
+
+    def get_parents(self):
+        """
+        :return: the parents of the cells
+        :rtype: array
+        """
+        return self.__parents
+
+    def get_costs(self):
+        """
+        :return: the costs of the cells
+        :rtype: array
+        """
+        return self.__costs
+
+    def get_memory(self):
+        """
+        :return: the number of bytes of the arrays
+        :rtype: int
+        """
+        stamps = self.__stamps
+        return len(stamps) * (stamps.itemsize + self.__parents.itemsize + self.__costs.itemsize)
+
+
+@contextmanager
+def search_buffers(size):
+    """
+    Lends SearchBuffers for size cells taken from the pool, and gives them back to the
+    pool at the end of the with statement. Each thread gets its own buffers. The buffers
+    of the sizes used the longest time ago are forgotten when the pool would exceed
+    POOL_BYTES bytes, and buffers larger than POOL_BYTES are never kept.
+
+    :param size: the number of cells
+    :type size: int
+    :return: the buffers
+    :rtype: SearchBuffers
+
+    :Examples:
+    >>> with search_buffers(6) as buffers:
+    ...     len(buffers.get_stamps())
+    6
+    >>> with search_buffers(6) as other:
+    ...     other is buffers
+    True
+    """
+    with _POOL_LOCK:
+        free = _POOL.get(size)
+        buffers = free.pop() if free else None
+    if buffers is None:
+        buffers = SearchBuffers(size)
+    try:
+        yield buffers
+    finally:
+        memory = buffers.get_memory()
+        with _POOL_LOCK:
+            free = _POOL.pop(size, [])
+            # the sizes are kept from the least to the most recently used
+            _POOL[size] = free
+            if memory > POOL_BYTES or len(free) >= POOL_SIZE:
+                if not free:
+                    del _POOL[size]
+            else:
+                while _POOL and (len(_POOL) > POOL_SIZE or _pool_memory() + memory > POOL_BYTES):
+                    oldest = next(iter(_POOL))
+                    if _POOL[oldest]:
+                        _POOL[oldest].pop()
+                    if not _POOL[oldest]:
+                        del _POOL[oldest]
+                _POOL.setdefault(size, []).append(buffers)
+
+
+def _pool_memory():
+    return sum(buffers.get_memory() for free in _POOL.values() for buffers in free)
+
+
+def pool_memory():
+    """
+    Returns the number of bytes of the free SearchBuffers kept in the pool.
+
+    :return: the number of bytes
+    :rtype: int
+
+    :Examples:
+    >>> with search_buffers(10) as buffers:
+    ...     pass
+    >>> 0 < pool_memory() <= POOL_BYTES
+    True
+    """
+    with _POOL_LOCK:
+        return _pool_memory()
+
+
+def clear_pool():
+    """
+    Forgets all the free SearchBuffers of the pool, so their memory can be freed.
+
+    :return: None
+
+    :Examples:
+    >>> with search_buffers(10) as buffers:
+    ...     pass
+    >>> clear_pool()
+    >>> pool_memory()
+    0
+    """
+    with _POOL_LOCK:
+        _POOL.clear()
+
+
+def path_to(parents, index, width):
+    """
+    Returns the coordinates of the cells of the path from the root of parents to the cell
+    at position index.
+
+    :param parents: the position of the parent of each cell, the root is its own parent
+    :type parents: array
+    :param index: the position of the last cell of the path
+    :type index: int
+    :param width: the width of the maze
+    :type width: int
+    :return: the coordinates of the cells of the path
+    :rtype: list
+
+    :Examples:
+    >>> path_to(array('l', [0, 0, 1, -1]), 2, 2)
+    [(0, 0), (1, 0), (0, 1)]
+    """
+    path = [(index % width, index // width)]
+    while parents[index] != index:
+        index = parents[index]
+        path.append((index % width, index // width))
+    path.reverse()
+    return path
+
+
+def bfs_path(maze, start, goal):
+    """
+    Returns a shortest path from start to goal in maze, found by a breadth-first search.
+
+    :param maze: a maze
+    :type maze: Maze
+    :param start: coordinates of the first cell of the path
+    :type start: tuple
+    :param goal: coordinates of the last cell of the path
+    :type goal: tuple
+    :return: the coordinates of the cells of the path, None if there is no path
+    :rtype: list
+
+    :UC: start and goal are coordinates of cells of maze
+
+    :Examples:
+    >>> from class_Maze import Maze
+    >>> maze = Maze(3, 2)
+    >>> maze.build_walls_right(0, 0)
+    >>> bfs_path(maze, (0, 0), (1, 0))
+    [(0, 0), (0, 1), (1, 1), (1, 0)]
+    >>> maze.build_walls_down(0, 0)
+    >>> bfs_path(maze, (0, 0), (1, 0)) is None
+    True
+    """
+    width = maze.get_width()
+    cells = maze.get_cells()
+    neighbors = maze.get_neighbors()
+    source = start[1] * width + start[0]
+    target = goal[1] * width + goal[0]
+    with search_buffers(len(cells)) as buffers:
+        epoch = buffers.next_epoch()
+        stamps = buffers.get_stamps()
+        parents = buffers.get_parents()
+        stamps[source] = epoch
+        parents[source] = source
+        queue = [source]
+        for index in queue:
+            if index == target:
+                return path_to(parents, target, width)
+            for direction in OPEN_DIRECTIONS[cells[index]]:
+                neighbor = neighbors[direction][index]
+                if neighbor >= 0 and stamps[neighbor] != epoch:
+                    stamps[neighbor] = epoch
+                    parents[neighbor] = index
+                    queue.append(neighbor)
+    return None
+
+
+def astar_search(maze, start, goal):
+    """
+    Returns a shortest path from start to goal in maze found by the A* algorithm, with the
+    Manhattan distance to goal as heuristic, and the number of cells it expanded.
+
+    :param maze: a maze
+    :type maze: Maze
+    :param start: coordinates of the first cell of the path
+    :type start: tuple
+    :param goal: coordinates of the last cell of the path
+    :type goal: tuple
+    :return: the coordinates of the cells of the path (None if there is no path) and the number of expanded cells
+    :rtype: tuple
+
+    :UC: start and goal are coordinates of cells of maze
+
+    :Examples:
+    >>> from class_Maze import Maze
+    >>> maze = Maze(10, 10)
+    >>> path, expanded = astar_search(maze, (0, 0), (9, 0))
+    >>> len(path), expanded
+    (10, 10)
+    >>> len(bfs_path(maze, (0, 0), (9, 0)))
+    10
+    >>> maze.build_walls_right(4, 0)
+    >>> path, expanded = astar_search(maze, (0, 0), (9, 0))
+    >>> len(path)
+    12
+    """
+    width = maze.get_width()
+    cells = maze.get_cells()
+    neighbors = maze.get_neighbors()
+    goal_x, goal_y = goal
+    source = start[1] * width + start[0]
+    target = goal_y * width + goal_x
+    with search_buffers(len(cells)) as buffers:
+        # the cells reached are stamped with opened, the expanded cells with closed
+        opened = buffers.next_epoch(2)
+        closed = opened + 1
+        stamps = buffers.get_stamps()
+        costs = buffers.get_costs()
+        parents = buffers.get_parents()
+        stamps[source] = opened
+        costs[source] = 0
+        parents[source] = source
+        estimate = abs(start[0] - goal_x) + abs(start[1] - goal_y)
+        heap = [(estimate, estimate, source)]
+        expanded = 0
+        while heap:
+            total, estimate, index = heappop(heap)
+            if stamps[index] == closed:
+                continue
+            stamps[index] = closed
+            expanded += 1
+            if index == target:
+                return path_to(parents, target, width), expanded
+            cost = costs[index] + 1
+            for direction in OPEN_DIRECTIONS[cells[index]]:
+                neighbor = neighbors[direction][index]
+                if neighbor < 0:
+                    continue
+                stamp = stamps[neighbor]
+                if stamp != closed and (stamp != opened or cost < costs[neighbor]):
+                    stamps[neighbor] = opened
+                    costs[neighbor] = cost
+                    parents[neighbor] = index
+                    estimate = abs(neighbor % width - goal_x) + abs(neighbor // width - goal_y)
+                    heappush(heap, (cost + estimate, estimate, neighbor))
+    return None, expanded
+
+
+def astar_path(maze, start, goal):
+    """
+    Returns a shortest path from start to goal in maze, found by the A* algorithm.
+    See astar_search.
+
+    :return: the coordinates of the cells of the path, None if there is no path
+    :rtype: list
+
+    :Examples:
+    >>> from class_Maze import Maze
+    >>> astar_path(Maze(2, 2), (1, 1), (0, 1))
+    [(1, 1), (0, 1)]
+    """
+    return astar_search(maze, start, goal)[0]
+
+
+def bidirectional_path(maze, start, goal):
+    """
+    Returns a shortest path from start to goal in maze, found by two breadth-first searches
+    growing from start and from goal. The smaller frontier grows by one level at a time and
+    the search stops as soon as the frontiers meet.
+
+    :param maze: a maze
+    :type maze: Maze
+    :param start: coordinates of the first cell of the path
+    :type start: tuple
+    :param goal: coordinates of the last cell of the path
+    :type goal: tuple
+    :return: the coordinates of the cells of the path, None if there is no path
+    :rtype: list
+
+    :UC: start and goal are coordinates of cells of maze
+
+    :Examples:
+    >>> from class_Maze import Maze
+    >>> maze = Maze(3, 2)
+    >>> maze.build_walls_right(0, 0)
+    >>> bidirectional_path(maze, (0, 0), (1, 0))
+    [(0, 0), (0, 1), (1, 1), (1, 0)]
+    >>> bidirectional_path(maze, (2, 1), (2, 1))
+    [(2, 1)]
+    >>> maze.build_walls_down(0, 0)
+    >>> bidirectional_path(maze, (0, 0), (1, 0)) is None
+    True
+    >>> len(bidirectional_path(Maze(9, 9), (0, 0), (8, 8)))
+    17
+    """
+    width = maze.get_width()
+    cells = maze.get_cells()
+    neighbors = maze.get_neighbors()
+    source = start[1] * width + start[0]
+    target = goal[1] * width + goal[0]
+    if source == target:
+        return [start]
+    with search_buffers(len(cells)) as buffers:
+        # depths are counted from 1 from start and from -1 from goal, for the cells stamped with epoch
+        epoch = buffers.next_epoch()
+        stamps = buffers.get_stamps()
+        parents = buffers.get_parents()
+        depths = buffers.get_costs()
+        stamps[source] = stamps[target] = epoch
+        parents[source] = source
+        parents[target] = target
+        depths[source] = 1
+        depths[target] = -1
+        frontiers = [[source], [target]]
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            sign = 1 - 2 * side
+            best = None
+            next_frontier = []
+            for index in frontiers[side]:
+                depth = depths[index] + sign
+                for direction in OPEN_DIRECTIONS[cells[index]]:
+                    neighbor = neighbors[direction][index]
+                    if neighbor < 0:
+                        continue
+                    if stamps[neighbor] != epoch:
+                        stamps[neighbor] = epoch
+                        parents[neighbor] = index
+                        depths[neighbor] = depth
+                        next_frontier.append(neighbor)
+                    elif depths[neighbor] * sign < 0:
+                        length = abs(depth) + abs(depths[neighbor])
+                        if best is None or length < best[0]:
+                            best = (length, index, neighbor)
+            if best is not None:
+                length, index, neighbor = best
+                if side == 1:
+                    index, neighbor = neighbor, index
+                path = path_to(parents, index, width)
+                path.extend(reversed(path_to(parents, neighbor, width)))
+                return path
+            frontiers[side] = next_frontier
+    return None
+
+
+def dead_end_filling(maze, start, goal):
+    """
+    Returns the cells of the path from start to goal in the perfect maze maze, found by
+    filling the dead ends : a cell with only one open side which is neither start nor goal
+    is filled, which may turn its neighbor into a new dead end. The number of open sides
+    of all the cells is computed at once by bytes.translate, then each cell is filled at
+    most once.
+
+    :param maze: a perfect maze
+    :type maze: Maze
+    :param start: coordinates of the first cell of the path
+    :type start: tuple
+    :param goal: coordinates of the last cell of the path
+    :type goal: tuple
+    :return: for each cell, 1 if it is on the path and 0 if not
+    :rtype: bytearray
+
+    :UC: maze is perfect, start and goal are coordinates of cells of maze
+
+    :Examples:
+    >>> from class_Maze import Maze
+    >>> maze = Maze(3, 2)
+    >>> maze.build_walls_down(1, 0)
+    >>> maze.build_walls_right(0, 1)
+    >>> list(dead_end_filling(maze, (0, 1), (2, 0)))
+    [1, 1, 1, 1, 0, 0]
+    """
+    width = maze.get_width()
+    cells = maze.get_cells()
+    neighbors = maze.get_neighbors()
+    source = start[1] * width + start[0]
+    target = goal[1] * width + goal[0]
+    counts = bytearray(cells.translate(_OPEN_COUNTS))
+    path = bytearray(b'\x01') * len(cells)
+    dead_ends = []
+    for count in (0, 1):
+        index = counts.find(count)
+        while index >= 0:
+            dead_ends.append(index)
+            index = counts.find(count, index + 1)
+    for index in dead_ends:
+        if index == source or index == target:
+            continue
+        path[index] = 0
+        for direction in OPEN_DIRECTIONS[cells[index]]:
+            neighbor = neighbors[direction][index]
+            if neighbor >= 0 and path[neighbor]:
+                counts[neighbor] -= 1
+                if counts[neighbor] == 1:
+                    dead_ends.append(neighbor)
+    return path
+
+
+def solve_many(maze, pairs):
+    """
+    Yields a shortest path for each (start, goal) pair of pairs. The pairs are grouped by
+    start and one breadth-first search is run for each distinct start, stopped as soon
+    as all the goals of its pairs are reached. The results of a start are yielded as soon
+    as its search is finished, so they come grouped by start, in the order in which the
+    starts first appear in pairs.
+
+    :param maze: a maze
+    :type maze: Maze
+    :param pairs: the (start, goal) pairs of coordinates of cells
+    :type pairs: iterable
+    :return: the (start, goal, path) triples, path is None if there is no path
+    :rtype: generator
+
+    :UC: the coordinates are coordinates of cells of maze
+
+    :Examples:
+    >>> from class_Maze import Maze
+    >>> maze = Maze(3, 2)
+    >>> maze.build_walls_right(0, 0)
+    >>> for start, goal, path in solve_many(maze, [((0, 0), (1, 0)), ((2, 1), (2, 0)), ((0, 0), (0, 1))]):
+    ...     print(start, goal, path)
+    (0, 0) (1, 0) [(0, 0), (0, 1), (1, 1), (1, 0)]
+    (0, 0) (0, 1) [(0, 0), (0, 1)]
+    (2, 1) (2, 0) [(2, 1), (2, 0)]
+    """
+    width = maze.get_width()
+    cells = maze.get_cells()
+    neighbors = maze.get_neighbors()
+    groups = {}
+    for start, goal in pairs:
+        groups.setdefault(start, []).append(goal)
+    for start, goals in groups.items():
+        source = start[1] * width + start[0]
+        with search_buffers(len(cells)) as buffers:
+            epoch = buffers.next_epoch()
+            stamps = buffers.get_stamps()
+            parents = buffers.get_parents()
+            stamps[source] = epoch
+            parents[source] = source
+            targets = set(goal[1] * width + goal[0] for goal in goals)
+            targets.discard(source)
+            queue = [source]
+            for index in queue:
+                if not targets:
+                    break
+                for direction in OPEN_DIRECTIONS[cells[index]]:
+                    neighbor = neighbors[direction][index]
+                    if neighbor >= 0 and stamps[neighbor] != epoch:
+                        stamps[neighbor] = epoch
+                        parents[neighbor] = index
+                        queue.append(neighbor)
+                        targets.discard(neighbor)
+            results = []
+            for goal in goals:
+                target = goal[1] * width + goal[0]
+                results.append((start, goal, path_to(parents, target, width) if stamps[target] == epoch else None))
+        yield from results
+
+
+def nearest_paths(maze, starts, goals):
+    """
+    Yields for each cell of starts a shortest path to the nearest cell of goals. A single
+    breadth-first search is run from all the goals at once, stopped as soon as all the
+    starts are reached.
+
+    :param maze: a maze
+    :type maze: Maze
+    :param starts: coordinates of the first cells of the paths
+    :type starts: iterable
+    :param goals: coordinates of the cells where the paths may end
+    :type goals: iterable
+    :return: the (start, path) pairs, path is None if no goal can be reached from start
+    :rtype: generator
+
+    :UC: the coordinates are coordinates of cells of maze
+
+    :Examples:
+    >>> from class_Maze import Maze
+    >>> maze = Maze(4, 1)
+    >>> maze.build_walls_right(2, 0)
+    >>> for start, path in nearest_paths(maze, [(1, 0), (2, 0), (3, 0)], [(0, 0), (3, 0)]):
+    ...     print(start, path)
+    (1, 0) [(1, 0), (0, 0)]
+    (2, 0) [(2, 0), (1, 0), (0, 0)]
+    (3, 0) [(3, 0)]
+    """
+    width = maze.get_width()
+    cells = maze.get_cells()
+    neighbors = maze.get_neighbors()
+    starts = list(starts)
+    with search_buffers(len(cells)) as buffers:
+        epoch = buffers.next_epoch()
+        stamps = buffers.get_stamps()
+        parents = buffers.get_parents()
+        queue = []
+        for goal in goals:
+            target = goal[1] * width + goal[0]
+            if stamps[target] != epoch:
+                stamps[target] = epoch
+                parents[target] = target
+                queue.append(target)
+        sources = set(start[1] * width + start[0] for start in starts)
+        sources.difference_update(queue)
+        for index in queue:
+            if not sources:
+                break
+            for direction in OPEN_DIRECTIONS[cells[index]]:
+                neighbor = neighbors[direction][index]
+                if neighbor >= 0 and stamps[neighbor] != epoch:
+                    stamps[neighbor] = epoch
+                    parents[neighbor] = index
+                    queue.append(neighbor)
+                    sources.discard(neighbor)
+        results = []
+        for start in starts:
+            source = start[1] * width + start[0]
+            if stamps[source] == epoch:
+                path = path_to(parents, source, width)
+                path.reverse()
+                results.append((start, path))
+            else:
+                results.append((start, None))
+    yield from results
+
+
+SOLVERS = {'bfs': bfs_path,
+           'astar': astar_path,
+           'bidirectional': bidirectional_path}
+
+
+def find_path(maze, start, goal, algorithm='bfs'):
+    """
+    Returns a path from start to goal in maze, found by algorithm.
+
+    :param maze: a maze
+    :type maze: Maze
+    :param start: coordinates of the first cell of the path
+    :type start: tuple
+    :param goal: coordinates of the last cell of the path
+    :type goal: tuple
+    :param algorithm: the name of the algorithm, a key of SOLVERS
+    :type algorithm: str
+    :return: the coordinates of the cells of the path, None if there is no path
+    :rtype: list
+
+    :UC: start and goal are coordinates of cells of maze
+
+    :Examples:
+    >>> from class_Maze import Maze
+    >>> find_path(Maze(2, 2), (0, 0), (0, 0))
+    [(0, 0)]
+    """
+    return SOLVERS[algorithm](maze, start, goal)
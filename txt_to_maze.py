@@ -3,7 +3,7 @@
 
 """
 Script used to build a maze from a .txt file.
-Use the function file_to_maze.
+Use the function file_to_maze, or read_maze for a file anywhere.
 
 :author: `BART Sébastien / ELABDALLAH Mohammed / KROL Mikolaï`
 
@@ -12,9 +12,14 @@ Use the function file_to_maze.
 
 """
 
+import os
 from class_Maze import *
 
 
+_BAR_BITS = bytes(1 if byte == ord('|') else 0 for byte in range(256))
+_DASH_BITS = bytes(1 if byte == ord('-') else 0 for byte in range(256))
+
+
 def str_to_list_wall_right(s, width):
     """
     Function used in fichier_to_maze.
@@ -45,6 +50,98 @@ def str_to_list_wall_down(s, width):
     return l
 
 
+def row_walls(rows, bottoms, width):
+    """
+    Returns the right and bottom walls of the cells of consecutive rows, from the lines
+    of their description in the format written by Maze.to_txt.
+    
+    :param rows: the lines of the cells of the rows
+    :type rows: list
+    :param bottoms: the lines of the bottom walls of the rows
+    :type bottoms: list
+    :param width: width of the maze
+    :type width: int
+    :return: 1 for the cells with a right wall, 0 for the others, and the same for the bottom walls
+    :rtype: tuple
+    
+    Example:
+    >>> rights, downs = row_walls([b'|   | |'], [b'+-+ + +'], 3)
+    >>> list(rights), list(downs)
+    ([0, 1, 1], [1, 0, 0])
+    """
+    rights = b''.join(row[2:2 * width + 1:2] for row in rows)
+    downs = b''.join(bottom[1:2 * width:2] for bottom in bottoms)
+    return rights.translate(_BAR_BITS), downs.translate(_DASH_BITS)
+
+
+def text_to_maze(text):
+    """
+    Returns the maze described by text, in the format written by Maze.to_txt.
+    The walls of all the cells are read at once : the characters of the right walls and
+    of the bottom walls are taken by slicing the lines (see row_walls) and turned into
+    flags by bytes.translate and big integer operations (see maze_from_walls).
+    
+    :param text: the description of a maze
+    :type text: bytes or str
+    :return: the maze
+    :rtype: Maze
+    
+    :UC: text must be a valid description of a maze.
+    
+    Example:
+    >>> maze = text_to_maze(b'3\\n2\\n+-+-+-+\\n|   | |\\n+-+ + +\\n|x    |\\n+-+-+-+\\n')
+    >>> maze
+    +-+-+-+
+    |   | |
+    +-+ + +
+    |     |
+    +-+-+-+
+    <BLANKLINE>
+    >>> maze.is_there_a_wall((0, 0), (0, 1)), maze.is_there_a_wall((1, 0), (1, 1))
+    (True, False)
+    """
+    if isinstance(text, str):
+        text = text.encode('ascii')
+    lines = text.splitlines()
+    width = int(lines[0])
+    height = int(lines[1])
+    rights, downs = row_walls(lines[3:3 + 2 * height:2], lines[4:4 + 2 * height:2], width)
+    return maze_from_walls(width, height, rights, downs)
+
+
+def read_maze(file):
+    """
+    Returns the maze described in file, in the format written by Maze.to_txt.
+    The file is read in one go, see text_to_maze.
+    
+    :param file: the path of the file, or a file open for reading
+    :type file: str, os.PathLike or file
+    :return: the maze
+    :rtype: Maze
+    
+    :UC: the file must be a valid description of a maze.
+    
+    Example:
+    >>> import io
+    >>> read_maze(io.StringIO('2\\n1\\n+-+-+\\n| | |\\n+-+-+\\n'))
+    +-+-+
+    | | |
+    +-+-+
+    <BLANKLINE>
+    >>> import pathlib, tempfile
+    >>> folder = tempfile.TemporaryDirectory()
+    >>> path = pathlib.Path(folder.name, 'maze.txt')
+    >>> Maze(3, 2).to_txt(str(path))
+    >>> str(read_maze(path)) == str(Maze(3, 2))
+    True
+    >>> folder.cleanup()
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as in_stream:
+            return text_to_maze(in_stream.read())
+    return text_to_maze(file.read())
+
+
 def file_to_maze(file):
     """
     Returns a maze build from a description in a txt file.
@@ -53,6 +150,7 @@ def file_to_maze(file):
     :type file: str
     
     :UC: the file must be located in the folder ../txt and must be a valid description of a maze.
+    Use read_maze for a file located anywhere.
     
     Example:
     >>> file_to_maze('maze_5_5_0.txt')
@@ -69,21 +167,4 @@ def file_to_maze(file):
     +-+-+-+-+-+
     <BLANKLINE>
     """
-    with open('../txt/'+file, 'rt') as stream:
-        width=int(stream.readline())
-        height=int(stream.readline())
-        maze=Maze(width, height)
-        stream.readline()
-        
-        for y in range(height):
-            ligne1=stream.readline()
-            ligne1=str_to_list_wall_right(ligne1, width)
-            ligne2=stream.readline()
-            ligne2=str_to_list_wall_down(ligne2, width)
-            
-            for x in range(width):
-                if ligne1[x]=='|':
-                    maze.build_walls_right(x,y)
-                if ligne2[x]=='-':
-                    maze.build_walls_down(x,y)
-        return maze
\ No newline at end of file
+    return read_maze('../txt/' + file)
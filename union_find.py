@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+:mod:`union_find` module
+
+:author: `BART Sébastien / ELABDALLAH Mohammed / KROL Mikolaï`
+
+:date: 2018, november.
+
+A module for the union-find (disjoint sets) data structure over the
+integers 0, 1, ..., size-1, with union by size and path compression.
+
+:Provides:
+
+* class UnionFind
+
+and methods
+
+* `find`
+* `union`
+* `connected`
+
+:Examples:
+
+>>> sets = UnionFind(4)
+>>> sets.connected(0, 3)
+False
+>>> sets.union(0, 1)
+True
+>>> sets.union(1, 3)
+True
+>>> sets.connected(0, 3)
+True
+>>> sets.union(3, 0)
+False
+>>> sets.count()
+2
+"""
+
+from array import array
+
+
+class UnionFind():
+
+    def __init__(self, size):
+        """
+        :build: a new union-find where each integer 0 <= i < size is alone in its set
+        :UC: size >= 0
+        """
+        self.__parent = array('l', range(size))
+        self.__size = array('l', [1]) * size
+        self.__count = size
+
+    def find(self, i):
+        """
+        :param i: an integer
+        :type i: int
+        :return: the representative of the set of i
+        :rtype: int
+        :Side effect: the path from i to its representative is compressed
+        :UC: 0 <= i < size
+        """
+        parent = self.__parent
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    def union(self, i, j):
+        """
+        :param i: an integer
+        :type i: int
+        :param j: an integer
+        :type j: int
+        :return:
+           * ``True`` if the sets of i and j were different and have been merged
+           * ``False`` if i and j were already in the same set
+        :rtype: bool
+        :UC: 0 <= i, j < size
+        """
+        root_i = self.find(i)
+        root_j = self.find(j)
+        if root_i == root_j:
+            return False
+        if self.__size[root_i] < self.__size[root_j]:
+            root_i, root_j = root_j, root_i
+        self.__parent[root_j] = root_i
+        self.__size[root_i] += self.__size[root_j]
+        self.__count -= 1
+        return True
+
+    def connected(self, i, j):
+        """
+        :return:
+           * ``True`` if i and j are in the same set
+           * ``False`` otherwise
+        :rtype: bool
+        :UC: 0 <= i, j < size
+        """
+        return self.find(i) == self.find(j)
+
+    def count(self):
+        """
+        :return: the number of sets
+        :rtype: int
+        :UC: none
+        """
+        return self.__count
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod(optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS, verbose=True)